@@ -0,0 +1,210 @@
+import json
+from datetime import datetime, date
+import pandas as pd
+from parser import DATE_FORMAT
+
+PARTIAL_FORMAT_VERSION = 1
+
+class _ScenarioStats:
+    # Dates are day ordinals; unknown dates only count and set the flag.
+    # The bitmap has bit i set when the scenario failed on day base + i
+    __slots__ = ('count', 'first', 'last', 'unknown', 'base', 'bitmap')
+
+    def __init__(self):
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.unknown = False
+        self.base = None
+        self.bitmap = 0
+
+def _ordinal(value):
+    try:
+        return datetime.strptime(value, DATE_FORMAT).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+class FailureAggregator:
+    """Online per-scenario aggregation of failure records, memory grows with distinct scenarios only.
+
+    Keeps the failure count and first/last failure date of every scenario, and with
+    ``track_dates`` a bitmap of the days it failed on. ``since``/``until`` (Timestamps)
+    drop failures outside the range, including unknown dates, as ``cli.filter_by_date`` does.
+    """
+
+    def __init__(self, track_dates=False, since=None, until=None):
+        self.track_dates = track_dates
+        self.since = None if since is None else since.toordinal()
+        self.until = None if until is None else until.toordinal()
+        self.stats = {}
+
+    def add_records(self, records):
+        """Add parser records (dicts with 'Scenario' and a formatted 'Date')"""
+        ordinals = {}
+        for record in records:
+            value = record['Date']
+            if value not in ordinals:
+                ordinals[value] = _ordinal(value)
+            self.add(record['Scenario'], ordinals[value])
+
+    def add(self, scenario, ordinal):
+        """Count one failure of scenario on a day ordinal, None when the date is unknown"""
+        if ordinal is None:
+            if self.since is not None or self.until is not None:
+                return
+        elif (self.since is not None and ordinal < self.since) or (self.until is not None and ordinal > self.until):
+            return
+
+        stats = self.stats.get(scenario)
+        if stats is None:
+            stats = self.stats[scenario] = _ScenarioStats()
+        stats.count += 1
+        if ordinal is None:
+            stats.unknown = True
+            return
+        if stats.first is None or ordinal < stats.first:
+            stats.first = ordinal
+        if stats.last is None or ordinal > stats.last:
+            stats.last = ordinal
+        if self.track_dates:
+            if stats.base is None:
+                stats.base = ordinal
+            elif ordinal < stats.base:
+                stats.bitmap <<= stats.base - ordinal
+                stats.base = ordinal
+            stats.bitmap |= 1 << (ordinal - stats.base)
+
+    def __len__(self):
+        return len(self.stats)
+
+    def merge(self, other):
+        """Fold another aggregator into this one, as if its records had been added here.
+
+        Date bitmaps survive only when both sides track dates. Partials filtered on
+        different date ranges cannot be combined and raise ValueError.
+        """
+        if (self.since, self.until) != (other.since, other.until):
+            raise ValueError("cannot merge partial aggregates filtered on different date ranges")
+        if self.track_dates and not other.track_dates:
+            for stats in self.stats.values():
+                stats.base, stats.bitmap = None, 0
+        self.track_dates = self.track_dates and other.track_dates
+
+        for scenario, theirs in other.stats.items():
+            stats = self.stats.get(scenario)
+            if stats is None:
+                stats = self.stats[scenario] = _ScenarioStats()
+            stats.count += theirs.count
+            stats.unknown = stats.unknown or theirs.unknown
+            if theirs.first is not None and (stats.first is None or theirs.first < stats.first):
+                stats.first = theirs.first
+            if theirs.last is not None and (stats.last is None or theirs.last > stats.last):
+                stats.last = theirs.last
+            if self.track_dates and theirs.base is not None:
+                if stats.base is None:
+                    stats.base, stats.bitmap = theirs.base, theirs.bitmap
+                else:
+                    base = min(stats.base, theirs.base)
+                    stats.bitmap = (stats.bitmap << (stats.base - base)) | (theirs.bitmap << (theirs.base - base))
+                    stats.base = base
+        return self
+
+    def to_dict(self):
+        """JSON-ready partial aggregate: dates as ISO strings, bitmaps as hex"""
+        return {
+            'version': PARTIAL_FORMAT_VERSION,
+            'track_dates': self.track_dates,
+            'since': _iso(self.since),
+            'until': _iso(self.until),
+            'scenarios': {
+                scenario: [stats.count, _iso(stats.first), _iso(stats.last), stats.unknown,
+                           _iso(stats.base), format(stats.bitmap, 'x')]
+                for scenario, stats in self.stats.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get('version') != PARTIAL_FORMAT_VERSION:
+            raise ValueError(f"unsupported partial aggregate version: {data.get('version')}")
+        aggregator = cls(data['track_dates'], _from_iso(data['since']), _from_iso(data['until']))
+        for scenario, (count, first, last, unknown, base, bitmap) in data['scenarios'].items():
+            stats = aggregator.stats[scenario] = _ScenarioStats()
+            stats.count = count
+            stats.first = _ordinal_from_iso(first)
+            stats.last = _ordinal_from_iso(last)
+            stats.unknown = unknown
+            stats.base = _ordinal_from_iso(base)
+            stats.bitmap = int(bitmap, 16)
+        return aggregator
+
+    def save(self, path):
+        """Write the partial aggregate to a JSON file, to be combined later with load() and merge()"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def grouped(self):
+        """The per-scenario table exactly as analyzer.group_failures returns it"""
+        scenarios = sorted(self.stats)
+        columns = {'Failures': [], 'First Failed': [], 'Last Failed': []}
+        for scenario in scenarios:
+            stats = self.stats[scenario]
+            columns['Failures'].append(stats.count)
+            columns['First Failed'].append(_format(stats.first))
+            columns['Last Failed'].append(_format(stats.last))
+
+        grouped = pd.DataFrame({
+            'Failures': pd.Series(columns['Failures'], dtype='int64'),
+            'First Failed': pd.to_datetime(pd.Series(columns['First Failed'], dtype=object), format=DATE_FORMAT),
+            'Last Failed': pd.to_datetime(pd.Series(columns['Last Failed'], dtype=object), format=DATE_FORMAT),
+        })
+        grouped.index = pd.CategoricalIndex(scenarios, name='Scenario')
+        return grouped.sort_values('Failures', ascending=False)
+
+    def failure_dates(self):
+        """Distinct (Scenario, Date) pairs from the date bitmaps, for analyzer.failure_dates_display"""
+        if not self.track_dates:
+            raise ValueError("failure dates are only available with track_dates=True")
+        scenarios, dates = [], []
+        for scenario, stats in self.stats.items():
+            if stats.unknown:
+                scenarios.append(scenario)
+                dates.append(None)
+            bitmap, offset = stats.bitmap, 0
+            while bitmap:
+                if bitmap & 1:
+                    scenarios.append(scenario)
+                    dates.append(_format(stats.base + offset))
+                bitmap >>= 1
+                offset += 1
+        table = pd.DataFrame({'Scenario': scenarios, 'Date': pd.to_datetime(pd.Series(dates, dtype=object), format=DATE_FORMAT)})
+        return table.astype({'Scenario': 'category'})
+
+def merge_partials(partials):
+    """Reduce step: combine partial aggregates (e.g. loaded from several machines) into a new one"""
+    partials = list(partials)
+    if not partials:
+        return FailureAggregator()
+    merged = FailureAggregator(partials[0].track_dates)
+    merged.since, merged.until = partials[0].since, partials[0].until
+    for partial in partials:
+        merged.merge(partial)
+    return merged
+
+def _iso(ordinal):
+    return None if ordinal is None else date.fromordinal(ordinal).isoformat()
+
+def _from_iso(value):
+    return None if value is None else date.fromisoformat(value)
+
+def _ordinal_from_iso(value):
+    return None if value is None else date.fromisoformat(value).toordinal()
+
+def _format(ordinal):
+    # Dates go back through DATE_FORMAT so the datetime dtype matches parser.failure_table
+    return None if ordinal is None else date.fromordinal(ordinal).strftime(DATE_FORMAT)
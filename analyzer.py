@@ -1,29 +1,102 @@
 import pandas as pd
+from parser import DATE_FORMAT, UNKNOWN_DATE
 
 def group_failures(failure_data):
-    # Convert dates to datetime for proper sorting
-    failure_data = failure_data.copy()
-    failure_data['Date_dt'] = pd.to_datetime(
-        failure_data['Date'],
-        format='%d %B %Y',
-        errors='coerce'
-    )
-    
-    # Group and aggregate with proper date sorting
-    grouped = failure_data.groupby('Scenario').agg({
-        'Date': 'count',
-        'Date_dt': ['min', 'max']
+    # Dates are already datetime64 in the failure table, so min/max sort correctly
+    # and stay typed; formatting happens at display/export time
+    grouped = failure_data.groupby('Scenario', observed=True).agg(**{
+        'Failures': ('Date', 'size'),
+        'First Failed': ('Date', 'min'),
+        'Last Failed': ('Date', 'max')
     })
     
-    # Flatten multi-index columns
-    grouped.columns = ['Failures', 'First Failed_dt', 'Last Failed_dt']
-    
-    # Convert datetime back to original string format
-    grouped['First Failed'] = grouped['First Failed_dt'].dt.strftime('%d %B %Y')
-    grouped['Last Failed'] = grouped['Last Failed_dt'].dt.strftime('%d %B %Y')
-    
-    # Select and sort final columns
-    grouped = grouped[['Failures', 'First Failed', 'Last Failed']]
     grouped = grouped.sort_values('Failures', ascending=False)
     
     return grouped
+
+def merge_grouped(grouped, other):
+    # Combine two group_failures results as if their failures had been grouped
+    # together; cost depends on the number of scenarios, not failures
+    combined = pd.concat([grouped, other])
+    merged = combined.groupby(level=0, observed=True).agg(**{
+        'Failures': ('Failures', 'sum'),
+        'First Failed': ('First Failed', 'min'),
+        'Last Failed': ('Last Failed', 'max')
+    })
+    merged.index.name = 'Scenario'
+    
+    return merged.sort_values('Failures', ascending=False)
+
+def drop_files(failure_data, grouped, filenames):
+    # Remove every failure coming from the given files and regroup only the
+    # scenarios those failures belonged to
+    removed = failure_data['Filename'].isin(filenames)
+    affected = failure_data.loc[removed, 'Scenario'].unique()
+    failure_data = failure_data[~removed]
+    
+    grouped = grouped.drop(affected, errors='ignore')
+    remaining = failure_data[failure_data['Scenario'].isin(affected)]
+    if not remaining.empty:
+        grouped = merge_grouped(grouped, group_failures(remaining))
+    
+    return failure_data, grouped
+
+def failure_dates_display(failure_data):
+    # Per scenario, the unique failure dates as one display string. When all
+    # dates fall in the same year the year is only written once at the end.
+    # Everything is computed on unique (scenario, date) pairs with vectorized
+    # operations, only the final per-scenario join runs in Python
+    scenarios = failure_data['Scenario']
+    has_unknown = failure_data['Date'].isna().groupby(scenarios, observed=True).any()
+    
+    known = failure_data.loc[failure_data['Date'].notna(), ['Scenario', 'Date']]
+    known = known.drop_duplicates().sort_values(['Scenario', 'Date'])
+    years = known['Date'].dt.year.groupby(known['Scenario'], observed=True).agg(['nunique', 'size', 'first'])
+    collapsed = (years['nunique'] == 1) & (years['size'] > 1) & ~has_unknown.reindex(years.index, fill_value=False)
+    
+    # strftime once per distinct date, then look the labels up
+    unique_dates = pd.DatetimeIndex(known['Date'].unique())
+    full_labels = known['Date'].map(pd.Series(unique_dates.strftime(DATE_FORMAT), index=unique_dates))
+    short_labels = known['Date'].map(pd.Series(unique_dates.strftime("%d %B"), index=unique_dates))
+    row_collapsed = known['Scenario'].map(collapsed).astype(bool)
+    labels = full_labels.where(~row_collapsed, short_labels)
+    
+    displays = labels.groupby(known['Scenario'], observed=True).agg(", ".join).astype(object)
+    if collapsed.any():
+        # Empty selections are typed str by pandas 3, which will not add to object
+        displays[collapsed] = displays[collapsed] + " " + years.loc[collapsed, 'first'].astype(str).astype(object)
+    
+    # Unknown dates come first, scenarios without any known date show only that
+    displays = displays.reindex(has_unknown.index)
+    unknown_only = displays.isna()
+    displays[unknown_only] = UNKNOWN_DATE
+    prefix = has_unknown & ~unknown_only
+    displays[prefix] = UNKNOWN_DATE + ", " + displays[prefix]
+    return displays
+
+def index_by_date(failure_data):
+    # Sort once by date, unknown dates first, and record the row range of every
+    # date so filtering on one is a slice instead of a scan of the whole table.
+    # The unknown date is keyed by None
+    sorted_data = failure_data.sort_values('Date', kind='stable', na_position='first').reset_index(drop=True)
+    dates = sorted_data['Date']
+    unknown = int(dates.isna().sum())
+    ranges = {None: (0, unknown)} if unknown else {}
+    
+    # With a default index the row labels are the positions, so the first
+    # occurrence of each date is where its range starts
+    starts = dates.iloc[unknown:].drop_duplicates()
+    stops = list(starts.index[1:]) + [len(sorted_data)]
+    ranges.update(zip(starts, zip(starts.index, stops)))
+    return sorted_data, ranges
+
+def scenario_rows(sorted_data, start, stop, text):
+    # Positions in [start, stop) whose scenario contains text, ignoring case.
+    # The substring test runs once per distinct scenario name, rows are then
+    # selected through the categorical codes
+    if not text:
+        return range(start, stop)
+    scenarios = sorted_data['Scenario'].iloc[start:stop]
+    categories = scenarios.cat.categories
+    matching = categories[categories.str.contains(text, case=False, regex=False)]
+    return scenarios.index[scenarios.isin(matching).to_numpy()]
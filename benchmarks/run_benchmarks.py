@@ -0,0 +1,173 @@
+"""Time and memory-profile each stage of the analysis pipeline on synthetic logs.
+
+    python benchmarks/run_benchmarks.py -o report.json
+    python benchmarks/run_benchmarks.py --quick --compare report.json
+
+The generated logs are deterministic, so reports from different commits are comparable.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser
+from analyzer import group_failures, failure_dates_display
+from aggregator import FailureAggregator
+from formats import SUMMARY_WINDOW
+from synthetic_logs import generate_directory
+
+MB = 1024 * 1024
+CASES = (
+    {'name': 'many-small-utf8-lf', 'num_files': 200, 'size_bytes': MB // 4, 'failures': 20, 'encoding': 'utf-8', 'newline': '\n'},
+    {'name': 'few-large-utf8-crlf', 'num_files': 4, 'size_bytes': 64 * MB, 'failures': 200, 'encoding': 'utf-8', 'newline': '\r\n'},
+    {'name': 'utf16-lf', 'num_files': 20, 'size_bytes': 4 * MB, 'failures': 50, 'encoding': 'utf-16', 'newline': '\n'},
+    {'name': 'utf8-bom-lf', 'num_files': 20, 'size_bytes': 4 * MB, 'failures': 50, 'encoding': 'utf-8-sig', 'newline': '\n'},
+    {'name': 'cp1252-crlf', 'num_files': 20, 'size_bytes': 4 * MB, 'failures': 50, 'encoding': 'cp1252', 'newline': '\r\n'},
+    # One nightly run: no scenario has two dates, so failure_dates_display collapses no year
+    {'name': 'single-run', 'num_files': 1, 'size_bytes': MB, 'failures': 20, 'encoding': 'utf-8', 'newline': '\n'},
+    {'name': 'long-failure-section', 'num_files': 10, 'size_bytes': 8 * MB, 'failures': 5000, 'encoding': 'utf-8', 'newline': '\n'},
+)
+
+
+def _each_file(function):
+    def run(paths, encodings, table):
+        for path in paths:
+            function(path, encodings[path])
+    return run
+
+
+def _detect_encodings(paths, encodings, table):
+    parser.clear_encoding_cache()
+    for path in paths:
+        parser.detect_file_encoding(path)
+
+
+STAGES = (
+    ('detect_encoding', _detect_encodings),
+    ('read_last_lines', _each_file(lambda path, encoding: parser.read_last_lines(path, SUMMARY_WINDOW, encoding))),
+    ('tail_section', _each_file(parser.read_failure_section)),
+    ('full_scan_section', _each_file(parser.scan_failure_section)),
+    ('parse_reverse', lambda paths, encodings, table: parser.parse_test_results(os.path.dirname(paths[0]), True, 1)),
+    ('parse_full_scan', lambda paths, encodings, table: parser.parse_test_results(os.path.dirname(paths[0]), False, 1)),
+    ('parse_streaming', lambda paths, encodings, table: parser.parse_test_results(os.path.dirname(paths[0]), True, 1,
+                                                                                  aggregator=FailureAggregator())),
+    ('group_failures', lambda paths, encodings, table: group_failures(table)),
+    ('failure_dates_display', lambda paths, encodings, table: failure_dates_display(table)),
+)
+
+
+def measure(stage, paths, encodings, table, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage(paths, encodings, table)
+        timings.append(time.perf_counter() - start)
+
+    # Separate run for memory, tracemalloc slows the code down too much to time it
+    tracemalloc.start()
+    try:
+        stage(paths, encodings, table)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'min_s': min(timings), 'median_s': statistics.median(timings), 'peak_bytes': peak}
+
+
+def run_case(case, data_dir, repeat, stages):
+    directory = os.path.join(data_dir, case['name'])
+    paths = generate_directory(directory, case['num_files'], case['size_bytes'], case['failures'],
+                               case['encoding'], case['newline'])
+    encodings = {path: parser.detect_file_encoding(path) or 'utf-8' for path in paths}
+    table = parser.parse_test_results(directory, True, 1)
+
+    results = []
+    for stage_name, stage in STAGES:
+        if stages and stage_name not in stages:
+            continue
+        result = {'case': case['name'], 'stage': stage_name}
+        result.update(measure(stage, paths, encodings, table, repeat))
+        print(f"{case['name']:<24} {stage_name:<22} {result['median_s'] * 1000:>10.1f} ms {result['peak_bytes'] / MB:>9.2f} MB")
+        results.append(result)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print the median time and peak memory ratio of each stage against a previous report"""
+    previous = {(result['case'], result['stage']): result for result in baseline['results']}
+    print(f"\n{'case':<24} {'stage':<22} {'time':>8} {'memory':>8}   (current / baseline)")
+    for result in report['results']:
+        old = previous.get((result['case'], result['stage']))
+        if old is None:
+            continue
+        time_ratio = result['median_s'] / old['median_s'] if old['median_s'] else float('nan')
+        memory_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else float('nan')
+        print(f"{result['case']:<24} {result['stage']:<22} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x")
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Benchmark the test failure analyzer pipeline")
+    arg_parser.add_argument('-o', '--output', default='benchmark_report.json', help="Where to write the JSON report")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="Timed runs per stage")
+    arg_parser.add_argument('--scale', type=float, default=1.0, help="Multiply every file size by this factor")
+    arg_parser.add_argument('--quick', action='store_true', help="Shortcut for --scale 0.05 --repeat 1")
+    arg_parser.add_argument('--case', action='append', help="Only run the named case, repeatable")
+    arg_parser.add_argument('--stage', action='append', help="Only run the named stage, repeatable")
+    arg_parser.add_argument('--data-dir', help="Keep the generated logs here instead of a temporary directory")
+    arg_parser.add_argument('--compare', help="Previous JSON report to compare against")
+    args = arg_parser.parse_args(argv)
+
+    if args.quick:
+        args.scale, args.repeat = 0.05, 1
+    cases = [dict(case, size_bytes=int(case['size_bytes'] * args.scale)) for case in CASES
+             if not args.case or case['name'] in args.case]
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='tfa-bench-')
+    try:
+        results = []
+        for case in cases:
+            results.extend(run_case(case, data_dir, args.repeat, args.stage))
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeat': args.repeat,
+            'scale': args.scale,
+            'cases': cases,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
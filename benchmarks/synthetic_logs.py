@@ -0,0 +1,51 @@
+"""Deterministic generator of behave/Selenium style result logs for benchmarking."""
+import os
+import random
+from datetime import date, timedelta
+
+FEATURES = ('login', 'checkout', 'search', 'profile', 'payment', 'cart', 'admin', 'reports')
+# Scenario titles include non-ASCII text so the cp1252/UTF-16 variants really differ from UTF-8
+TITLES = ('Valid user logs in', 'Guest checkout', 'Search by café name', 'Update profile photo',
+          'Pay with saved card', 'Remove item from cart', 'Résumé upload', 'Export monthly report')
+STEP_WORDS = ('Given', 'When', 'Then', 'And')
+# Codecs that write a BOM once per file would add it to every separately encoded line
+_BOMLESS = {'utf-16': 'utf-16-le', 'utf-32': 'utf-32-le', 'utf-8-sig': 'utf-8'}
+
+
+def generate_log(path, size_bytes, failures, encoding='utf-8', newline='\n', seed=0, scenario_pool=200):
+    """Write one log of roughly ``size_bytes`` encoded bytes ending in a failure section and summary"""
+    rng = random.Random(seed)
+    size_encoding = _BOMLESS.get(encoding.lower().replace('_', '-'), encoding)
+    written = 0
+    with open(path, 'w', encoding=encoding, newline=newline) as f:
+        while written < size_bytes:
+            feature = rng.choice(FEATURES)
+            note = " (café)" if rng.random() < 0.01 else ""
+            line = f"  {rng.choice(STEP_WORDS)} the {feature} page step {rng.randint(1, 500)}{note} passes ... passed in 0.{rng.randint(100, 999)}s\n"
+            f.write(line)
+            written += len(line.replace('\n', newline).encode(size_encoding))
+
+        f.write("\nFailing scenarios:\n")
+        for _ in range(failures):
+            index = rng.randrange(scenario_pool)
+            feature = FEATURES[index % len(FEATURES)]
+            title = TITLES[index % len(TITLES)]
+            f.write(f"  {feature}_{index // len(FEATURES)}.feature:{10 + index}  {title} {index}\n")
+
+        f.write("\n3 features passed, 1 failed, 0 skipped\n")
+        f.write(f"{rng.randint(100, 900)} scenarios passed, {failures} failed, 0 skipped\n")
+        f.write(f"{rng.randint(1000, 9000)} steps passed, {failures} failed, 0 skipped, 0 undefined\n")
+        f.write(f"Took {rng.randint(1, 59)}m{rng.randint(0, 59)}.{rng.randint(0, 999)}s\n")
+
+
+def generate_directory(directory, num_files, size_bytes, failures, encoding='utf-8', newline='\n', seed=0):
+    """Write ``num_files`` logs named run_MMDDYYYY.txt on consecutive days; returns their paths"""
+    os.makedirs(directory, exist_ok=True)
+    start = date(2025, 1, 1)
+    paths = []
+    for i in range(num_files):
+        run_date = start + timedelta(days=i)
+        path = os.path.join(directory, f"run_{run_date.strftime('%m%d%Y')}.txt")
+        generate_log(path, size_bytes, failures, encoding, newline, seed=seed * 100003 + i)
+        paths.append(path)
+    return paths
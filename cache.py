@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+from formats import format_scanner
+
+FINGERPRINT_BYTES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump when a parser fix changes the results of already cached files
+CACHE_VERSION = 4
+
+def default_cache_path():
+    """Return the per-user location of the parse cache database"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'test-failure-analyzer', 'parse_cache.sqlite')
+
+def file_identity(filepath):
+    """Return (size, mtime_ns, fingerprint) where the fingerprint hashes the tail of the file"""
+    stat = os.stat(filepath)
+    with open(filepath, 'rb') as f:
+        f.seek(max(0, stat.st_size - FINGERPRINT_BYTES))
+        fingerprint = hashlib.blake2b(f.read(FINGERPRINT_BYTES), digest_size=16).hexdigest()
+    return stat.st_size, stat.st_mtime_ns, fingerprint
+
+class ParseCache:
+    """SQLite store of per-file parse results keyed by path, parse mode and file identity"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path or default_cache_path()
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT NOT NULL,
+                reverse_parse INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                encoding TEXT,
+                file_date TEXT,
+                scenarios TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (path, reverse_parse)
+            )
+        """)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # Results parsed by an older parser or with a different set of report formats may be wrong, start over
+        signature = f"{CACHE_VERSION}:{format_scanner().signature}"
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'formats'").fetchone()
+        if row is None or row[0] != signature:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('formats', ?)", (signature,))
+        self.conn.commit()
+
+    def get(self, filepath, reverse_parse, identity):
+        """Return (scenarios, encoding, file_date) for an unchanged file, or None on a miss"""
+        key = (os.path.abspath(filepath), int(reverse_parse))
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, fingerprint, encoding, file_date, scenarios FROM files WHERE path = ? AND reverse_parse = ?",
+            key
+        ).fetchone()
+        if row is None or tuple(row[:3]) != tuple(identity):
+            return None
+        self.conn.execute("UPDATE files SET last_used = ? WHERE path = ? AND reverse_parse = ?", (time.time(),) + key)
+        return json.loads(row[5]), row[3], row[4]
+
+    def put(self, filepath, reverse_parse, identity, scenarios, encoding, file_date):
+        size, mtime_ns, fingerprint = identity
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(filepath), int(reverse_parse), size, mtime_ns, fingerprint,
+             encoding, file_date, json.dumps(scenarios), time.time())
+        )
+
+    def commit(self):
+        """Persist pending updates and evict least recently used entries over the size limit"""
+        total = self.conn.execute("SELECT COALESCE(SUM(LENGTH(scenarios)), 0) FROM files").fetchone()[0]
+        if total > self.max_bytes:
+            rows = self.conn.execute("SELECT rowid, LENGTH(scenarios) FROM files ORDER BY last_used").fetchall()
+            evict = []
+            for rowid, length in rows:
+                if total <= self.max_bytes:
+                    break
+                evict.append((rowid,))
+                total -= length
+            self.conn.executemany("DELETE FROM files WHERE rowid = ?", evict)
+        self.conn.commit()
+
+    def clear(self):
+        """Drop every cached entry so the next analysis re-parses all files"""
+        self.conn.execute("DELETE FROM files")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def close(self):
+        self.conn.close()
@@ -1,61 +1,143 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from tkinter import BOTH, Toplevel, Button, messagebox
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from tkinter import BOTH, X, LEFT, Toplevel, Frame, Label, Button, StringVar, OptionMenu, messagebox, ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 
-def show_chart(root, failure_data):
-    if failure_data.empty:
-        messagebox.showwarning("Warning", "No data to visualize")
-        return
+ALL_SCENARIOS = "All scenarios"
+# Resampling frequency of each resolution; Auto picks one from the date span
+RESOLUTIONS = {
+    'Daily': 'D',
+    'Weekly': 'W-MON',
+    'Monthly': 'MS',
+}
+DAILY_MAX_DAYS = 92
+WEEKLY_MAX_DAYS = 2 * 366
+MARKER_MAX_POINTS = 60
 
-    try:
-        # Convert string dates to datetime objects and sort
-        chart_data = failure_data.copy()
-        chart_data['DateObj'] = pd.to_datetime(chart_data['Date'], errors='coerce', format='%d %B %Y')
-        chart_data = chart_data.dropna(subset=['DateObj']).sort_values('DateObj')
+def count_matrix(failure_data):
+    """Sparse date x scenario failure counts: a Series indexed by (Scenario, Date), sorted so
+    one scenario is a contiguous slice. Unknown dates are left out"""
+    known = failure_data.loc[failure_data['Date'].notna(), ['Scenario', 'Date']]
+    return known.groupby(['Scenario', 'Date'], observed=True).size().sort_index()
 
-        if chart_data.empty:
-            messagebox.showwarning("Warning", "No valid dates to visualize")
-            return
+def pick_resolution(dates):
+    """Daily for up to about three months of dates, weekly up to two years, monthly beyond"""
+    span = (dates.max() - dates.min()).days if len(dates) else 0
+    if span <= DAILY_MAX_DAYS:
+        return 'Daily'
+    if span <= WEEKLY_MAX_DAYS:
+        return 'Weekly'
+    return 'Monthly'
 
-        # Group by date and count failures
-        daily_failures = chart_data.groupby('DateObj').size()
+def resample_counts(counts, resolution):
+    # Periods are labelled by their first day (weeks start on Monday) and
+    # periods without failures become 0 instead of being skipped
+    return counts.resample(RESOLUTIONS[resolution], label='left', closed='left').sum()
 
-        # Create window
-        chart_window = Toplevel(root)
-        chart_window.title("Failure Trend Analysis")
-        chart_window.geometry("1000x700")
+class FailureChart:
+    """Failure trend window with one figure and canvas reused for every redraw.
 
-        # Create figure with larger size
-        fig, ax = plt.subplots(figsize=(12, 6))
+    The count matrix is built once per failure table; choosing a scenario or a
+    resolution only slices and resamples it.
+    """
 
-        # Use line plot instead of bar for better visibility
-        daily_failures.plot(kind='line', ax=ax, color='red', marker='o', linestyle='-')
+    def __init__(self, root):
+        self.failure_data = None
+        self.window = Toplevel(root)
+        self.window.title("Failure Trend Analysis")
+        self.window.geometry("1000x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
 
-        # Formatting
-        ax.set_title('Test Failure Trend', pad=20)
-        ax.set_xlabel('Date', labelpad=10)
-        ax.set_ylabel('Number of Failures', labelpad=10)
-        ax.grid(True, linestyle='--', alpha=0.7)
+        controls = Frame(self.window)
+        controls.pack(fill=X, padx=10, pady=5)
+        Label(controls, text="Scenario:").pack(side=LEFT, padx=5)
+        self.scenario = StringVar(value=ALL_SCENARIOS)
+        self.scenario_box = ttk.Combobox(controls, textvariable=self.scenario, width=70, state='readonly')
+        self.scenario_box.pack(side=LEFT, padx=5)
+        self.scenario_box.bind('<<ComboboxSelected>>', lambda event: self.redraw())
+        Label(controls, text="Resolution:").pack(side=LEFT, padx=5)
+        self.resolution = StringVar(value='Auto')
+        OptionMenu(controls, self.resolution, 'Auto', *RESOLUTIONS, command=lambda _: self.redraw()).pack(side=LEFT, padx=5)
 
-        # Format x-axis dates
-        ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%d %b %Y'))
-        fig.autofmt_xdate(rotation=45)
-        plt.tight_layout()
+        self.figure = Figure(figsize=(12, 6))
+        self.axes = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self.window)
+        self.toolbar.update()
+        self.canvas.get_tk_widget().pack(fill=BOTH, expand=True)
 
-        # Add canvas to window
-        canvas = FigureCanvasTkAgg(fig, master=chart_window)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
+        Button(self.window, text="Close", command=self.close).pack(pady=10)
 
-        # Add toolbar for navigation (optional)
-        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
-        toolbar = NavigationToolbar2Tk(canvas, chart_window)
-        toolbar.update()
-        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
+    def is_open(self):
+        return self.window is not None
 
-        # Close button
-        Button(chart_window, text="Close", command=chart_window.destroy).pack(pady=10)
+    def close(self):
+        # The figure is not registered with pyplot, dropping the references frees it
+        if self.window is None:
+            return
+        self.figure.clear()
+        self.canvas.get_tk_widget().destroy()
+        self.window.destroy()
+        self.window = self.canvas = self.toolbar = self.figure = self.axes = None
+
+    def update(self, failure_data, scenario=None):
+        """Show failure_data, rebuilding the count matrix only for a new table, and optionally select a scenario"""
+        if failure_data is not self.failure_data:
+            self.failure_data = failure_data
+            self.matrix = count_matrix(failure_data)
+            self.totals = self.matrix.groupby(level='Date').sum()
+            by_failures = self.matrix.groupby(level='Scenario', observed=True).sum().sort_values(ascending=False)
+            self.scenarios = set(by_failures.index)
+            self.scenario_box['values'] = [ALL_SCENARIOS] + list(by_failures.index)
+        if scenario is not None:
+            # Scenarios that only failed on unknown dates have nothing to plot
+            self.scenario.set(scenario if scenario in self.scenarios else ALL_SCENARIOS)
+        self.window.deiconify()
+        self.window.lift()
+        self.redraw()
 
+    def redraw(self):
+        if self.window is None:
+            return
+        scenario = self.scenario.get()
+        if scenario not in self.scenarios:
+            scenario, counts = None, self.totals
+        else:
+            counts = self.matrix.loc[scenario]
+        resolution = self.resolution.get()
+        if resolution == 'Auto':
+            # Picked from the whole history so a scenario uses the same scale as the totals
+            resolution = pick_resolution(self.totals.index)
+        series = resample_counts(counts, resolution)
+
+        self.axes.clear()
+        self.axes.plot(series.index, series.to_numpy(), color='red', linestyle='-',
+                       marker='o' if len(series) <= MARKER_MAX_POINTS else None)
+        if scenario is not None and self.totals.index.min() < self.totals.index.max():
+            self.axes.set_xlim(self.totals.index.min(), self.totals.index.max())
+        self.axes.set_title(f"Test Failure Trend - {scenario or ALL_SCENARIOS} ({resolution.lower()})", pad=20)
+        self.axes.set_xlabel('Date', labelpad=10)
+        self.axes.set_ylabel('Number of Failures', labelpad=10)
+        self.axes.grid(True, linestyle='--', alpha=0.7)
+        locator = mdates.AutoDateLocator()
+        self.axes.xaxis.set_major_locator(locator)
+        self.axes.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+def show_chart(root, failure_data, chart=None, scenario=None):
+    """Show the trend chart, reusing chart (a FailureChart) while its window is open; returns the chart in use"""
+    if failure_data.empty:
+        messagebox.showwarning("Warning", "No data to visualize")
+        return chart
+    if failure_data['Date'].isna().all():
+        messagebox.showwarning("Warning", "No valid dates to visualize")
+        return chart
+
+    try:
+        if chart is None or not chart.is_open():
+            chart = FailureChart(root)
+        chart.update(failure_data, scenario)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to generate chart: {str(e)}")
+    return chart
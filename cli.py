@@ -0,0 +1,241 @@
+"""Headless entry point: analyze result directories without the GUI.
+
+Only the parser, analyzer, aggregator, trends, exporter, cache and history modules are imported here, never tkinter or
+matplotlib, so it starts quickly and runs on build agents without a display.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import pandas as pd
+from parser import parse_test_results, concat_failure_tables, DEFAULT_WORKERS
+from analyzer import group_failures, merge_grouped, drop_files
+from aggregator import FailureAggregator, merge_partials
+from trends import TrendIndex, add_trend_columns, DEFAULT_WINDOW
+from exporter import EXPORT_VIEWS, EXPORT_FORMATS, view_table, format_chunk, export_view
+from cache import ParseCache
+from history import FailureHistory
+from watcher import DirectoryWatcher
+from instrumentation import IngestReport, run_profiled, top_functions
+
+OUTPUT_FORMATS = EXPORT_FORMATS
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(description="Analyze test failure reports from the command line")
+    arg_parser.add_argument('directories', nargs='*', help="Test results directories to analyze")
+    arg_parser.add_argument('--view', choices=EXPORT_VIEWS, default='grouped',
+                            help="Write one row per scenario (grouped), every failure (raw) or one row per date (per-date)")
+    arg_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', help="Output format")
+    arg_parser.add_argument('-o', '--output', default='-', help="Output file, '-' for stdout (default)")
+    arg_parser.add_argument('--since', type=_parse_date, help="Only include failures on or after this date (YYYY-MM-DD)")
+    arg_parser.add_argument('--until', type=_parse_date, help="Only include failures on or before this date (YYYY-MM-DD)")
+    arg_parser.add_argument('--full-scan', action='store_true', help="Scan whole files instead of parsing from the end")
+    arg_parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Number of worker processes")
+    arg_parser.add_argument('--cache', action='store_true', help="Reuse and update the persistent parse cache")
+    arg_parser.add_argument('--trends', action='store_true',
+                            help="Add failure rate, recent failures, streak and flakiness columns to the grouped view")
+    arg_parser.add_argument('--window', type=int, default=DEFAULT_WINDOW,
+                            help="Number of most recent runs counted in the Recent Failures column")
+    arg_parser.add_argument('--stream', action='store_true',
+                            help="Aggregate per scenario while parsing instead of keeping every failure in memory "
+                                 "(grouped view only)")
+    arg_parser.add_argument('--save-partial', metavar='PATH',
+                            help="Also save the per-scenario partial aggregate (counts, first/last and per-date sets) "
+                                 "to PATH for a later --merge-partial; implies --stream")
+    arg_parser.add_argument('--merge-partial', action='append', metavar='PATH',
+                            help="Combine a saved partial aggregate into the grouped output, repeatable; "
+                                 "implies --stream")
+    arg_parser.add_argument('--history', nargs='?', const='', metavar='PATH',
+                            help="Record every parsed failure in the failure history database "
+                                 "(per-user default location when PATH is omitted)")
+    arg_parser.add_argument('--from-history', action='store_true',
+                            help="Write the output from the failure history database instead of the parsed "
+                                 "directories; any directories given are recorded first")
+    arg_parser.add_argument('--report', help="Write a per-file timing report (JSON) to this path")
+    arg_parser.add_argument('--profile', help="Profile the parse with cProfile and save the stats to this path")
+    arg_parser.add_argument('-r', '--recursive', action='store_true', help="Also scan subdirectories")
+    arg_parser.add_argument('--include', action='append',
+                            help="Glob pattern of files to analyze, repeatable (default: *.txt and .gz/.bz2/.xz compressed logs)")
+    arg_parser.add_argument('--exclude', action='append', help="Glob pattern of files or directories to skip, repeatable")
+    arg_parser.add_argument('--watch', action='store_true',
+                            help="Keep running and ingest new or updated files; raw CSV/JSON output is appended, "
+                                 "everything else is rewritten on each update")
+    arg_parser.add_argument('--interval', type=float, default=5.0, help="Seconds between directory polls in watch mode")
+    return arg_parser
+
+def _parse_date(value):
+    try:
+        return pd.Timestamp(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value}")
+
+def filter_by_date(failure_data, since=None, until=None):
+    """Keep failures within [since, until]; failures with an unknown date are dropped when a bound is given"""
+    mask = pd.Series(True, index=failure_data.index)
+    if since is not None:
+        mask &= failure_data['Date'] >= since
+    if until is not None:
+        mask &= failure_data['Date'] <= until
+    return failure_data[mask]
+
+def build_output(failure_data, view, grouped=None):
+    """Return the table to write, with dates formatted as in the GUI"""
+    return format_chunk(view_table(view, failure_data, grouped))
+
+def write_output(output, output_format, destination, append=False):
+    to_stdout = destination == '-'
+    if output_format == 'csv':
+        if append:
+            output.to_csv(sys.stdout if to_stdout else destination, index=False, header=False, mode='a')
+        else:
+            output.to_csv(sys.stdout if to_stdout else destination, index=False)
+    elif output_format == 'json':
+        output.to_json(sys.stdout if to_stdout else destination, orient='records', lines=True, mode='a' if append else 'w')
+    else:
+        # Parquet is binary, write it to the raw stdout buffer
+        output.to_parquet(sys.stdout.buffer if to_stdout else destination, index=False)
+
+def open_history(args):
+    if args.history is None and not args.from_history:
+        return None
+    return FailureHistory(args.history or None)
+
+def main(argv=None):
+    arg_parser = build_arg_parser()
+    args = arg_parser.parse_args(argv)
+    if not args.directories and not args.from_history and not args.merge_partial:
+        arg_parser.error("at least one directory is required unless --from-history or --merge-partial is given")
+    if args.watch and args.from_history:
+        arg_parser.error("--watch cannot be combined with --from-history")
+    args.stream = args.stream or bool(args.save_partial or args.merge_partial)
+    if args.stream and (args.view != 'grouped' or args.watch or args.from_history):
+        arg_parser.error("--stream only supports the grouped view, without --watch or --from-history")
+    if args.trends and (args.view != 'grouped' or args.watch or args.from_history or args.stream):
+        arg_parser.error("--trends only supports the grouped view, without --watch, --from-history or --stream")
+    if not 1 <= args.window <= 62:
+        arg_parser.error("--window must be between 1 and 62")
+
+    cache = ParseCache() if args.cache else None
+    history = open_history(args)
+    aggregator = FailureAggregator(True, args.since, args.until) if args.stream else None
+    tables = []
+    errors = []
+    reports = []
+    runs = []
+    try:
+        for directory in args.directories:
+            reports.append(IngestReport())
+            parse_args = (directory, not args.full_scan, args.workers, errors, cache)
+            parse_kwargs = dict(recursive=args.recursive, include=args.include, exclude=args.exclude, report=reports[-1],
+                                history=history, aggregator=aggregator, runs=runs)
+            if args.profile:
+                tables.append(run_profiled(args.profile, parse_test_results, *parse_args, **parse_kwargs))
+            else:
+                tables.append(parse_test_results(*parse_args, **parse_kwargs))
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if history is not None:
+            history.close()
+        return 1
+    finally:
+        if cache is not None:
+            cache.close()
+
+    for filename, message in errors:
+        print(f"Error processing {filename}: {message}", file=sys.stderr)
+    for directory, report in zip(args.directories, reports):
+        print(f"{directory}: {report.summary()}", file=sys.stderr)
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({directory: report.to_dict() for directory, report in zip(args.directories, reports)}, f, indent=2)
+    if args.profile:
+        print(top_functions(args.profile), file=sys.stderr)
+
+    grouped = None
+    if args.from_history:
+        # Aggregates come straight from SQLite, the other views load the rows
+        if args.view == 'grouped':
+            failure_data, grouped = None, history.grouped(args.since, args.until)
+        else:
+            failure_data = history.failures(args.since, args.until)
+    elif aggregator is not None:
+        try:
+            if args.save_partial:
+                aggregator.save(args.save_partial)
+            if args.merge_partial:
+                aggregator = merge_partials([aggregator] + [FailureAggregator.load(path) for path in args.merge_partial])
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            if history is not None:
+                history.close()
+            return 1
+        failure_data, grouped = None, aggregator.grouped()
+    else:
+        failure_data = filter_by_date(concat_failure_tables(tables), args.since, args.until)
+        if args.trends:
+            run_dates = [date for _, date in runs if not pd.isna(date)
+                         and (args.since is None or date >= args.since) and (args.until is None or date <= args.until)]
+            grouped = add_trend_columns(group_failures(failure_data), TrendIndex.build(failure_data, run_dates, args.window))
+    if history is not None:
+        history.close()
+    try:
+        if args.output == '-':
+            write_output(build_output(failure_data, args.view, grouped), args.format, args.output)
+        else:
+            # Files are written in chunks, without a formatted copy of the whole table
+            export_view(args.output, args.format, args.view, failure_data, grouped)
+    except ImportError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.watch:
+        try:
+            watch(args, failure_data)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+def watch(args, failure_data):
+    """Poll the directories and write updates until interrupted"""
+    cache = ParseCache() if args.cache else None
+    history = open_history(args)
+    grouped = group_failures(failure_data)
+    watchers = []
+    for directory in args.directories:
+        # Files parsed in the first pass are the baseline
+        watcher = DirectoryWatcher(directory, args.recursive, args.include, args.exclude)
+        watcher.mark_processed()
+        watchers.append(watcher)
+
+    while True:
+        time.sleep(args.interval)
+        batches = []
+        stale = []
+        errors = []
+        for watcher in watchers:
+            ready, removed = watcher.poll()
+            stale.extend(os.path.relpath(path, watcher.directory) for path in ready + removed)
+            if ready:
+                batches.append(parse_test_results(watcher.directory, not args.full_scan, args.workers, errors, cache,
+                                                  files=ready, history=history))
+        for filename, message in errors:
+            print(f"Error processing {filename}: {message}", file=sys.stderr)
+        if not stale:
+            continue
+
+        if failure_data['Filename'].isin(stale).any():
+            failure_data, grouped = drop_files(failure_data, grouped, stale)
+        batch = filter_by_date(concat_failure_tables(batches), args.since, args.until) if batches else failure_data.iloc[:0]
+        if not batch.empty:
+            failure_data = concat_failure_tables([failure_data, batch])
+            grouped = merge_grouped(grouped, group_failures(batch))
+
+        if args.view == 'raw' and args.format != 'parquet':
+            write_output(build_output(batch, 'raw'), args.format, args.output, append=True)
+        else:
+            write_output(build_output(failure_data, args.view, grouped), args.format, args.output)
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import os
+import pandas as pd
+from parser import format_dates
+
+EXPORT_VIEWS = ('grouped', 'raw', 'per-date')
+EXPORT_FORMATS = ('csv', 'json', 'parquet')
+EXTENSIONS = {'csv': '.csv', 'json': '.jsonl', 'parquet': '.parquet'}
+CHUNK_ROWS = 50000
+
+def per_date_table(failure_data):
+    """Failures, distinct scenarios and files per failure date, unknown date first"""
+    per_date = failure_data.groupby('Date', dropna=False, sort=False).agg(**{
+        'Failures': ('Scenario', 'size'),
+        'Scenarios': ('Scenario', 'nunique'),
+        'Files': ('Filename', 'nunique'),
+    })
+    return per_date.sort_index(na_position='first').reset_index()
+
+def view_table(view, failure_data, grouped=None):
+    """The unformatted table behind a view; grouped reuses an already computed group_failures result"""
+    if view == 'raw':
+        return failure_data
+    if view == 'per-date':
+        return per_date_table(failure_data)
+    if grouped is None:
+        from analyzer import group_failures
+        grouped = group_failures(failure_data)
+    return grouped.reset_index()
+
+def format_chunk(chunk):
+    # Only the chunk being written is copied, with its dates formatted as in the GUI
+    dates = {column: format_dates(chunk[column]) for column in chunk.columns
+             if pd.api.types.is_datetime64_any_dtype(chunk[column])}
+    return chunk.assign(**dates)
+
+def iter_chunks(table, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(table), chunk_rows):
+        yield format_chunk(table.iloc[start:start + chunk_rows])
+
+def export_view(path, output_format, view, failure_data, grouped=None, progress=None, chunk_rows=CHUNK_ROWS):
+    """Write one view of the failure data to path in chunks of chunk_rows rows.
+
+    ``progress`` is called after each chunk as progress(rows_written, total_rows). A
+    failed export removes the partial file and re-raises. Returns the number of rows.
+    """
+    table = view_table(view, failure_data, grouped)
+    total = len(table)
+    try:
+        if output_format == 'parquet':
+            _write_parquet(path, table, progress, chunk_rows)
+        else:
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                if total == 0 and output_format == 'csv':
+                    format_chunk(table).to_csv(f, index=False)
+                for number, chunk in enumerate(iter_chunks(table, chunk_rows)):
+                    if output_format == 'csv':
+                        chunk.to_csv(f, index=False, header=number == 0, lineterminator='\n')
+                    else:
+                        chunk.to_json(f, orient='records', lines=True, force_ascii=False)
+                    if progress is not None:
+                        progress(min(total, (number + 1) * chunk_rows), total)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return total
+
+def _write_parquet(path, table, progress, chunk_rows):
+    # One row group per chunk through a single writer, so the file never has to be built in memory
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow")
+
+    schema = pa.Schema.from_pandas(format_chunk(table.iloc[:0]), preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for number, chunk in enumerate(iter_chunks(table, chunk_rows)):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            if progress is not None:
+                progress(min(len(table), (number + 1) * chunk_rows), len(table))
@@ -0,0 +1,158 @@
+import re
+import hashlib
+
+SUMMARY_WINDOW = 15
+
+class ReportFormat:
+    """How one test runner writes its failure summary at the end of a log.
+
+    ``markers`` are literal texts (matched case-insensitively, anywhere in a line) that
+    open a failure section, ``summary`` matches the run summary lines that follow it
+    within the last ``summary_window`` non-empty lines, and ``line`` matches one failure
+    line of the section, its first group being the scenario. Lines matching ``filler``
+    may sit inside a section without ending it.
+    """
+
+    def __init__(self, name, markers, summary, line, filler=None, summary_window=SUMMARY_WINDOW):
+        self.name = name
+        self.markers = tuple(markers)
+        self.summary = re.compile(summary)
+        self.line = re.compile(line)
+        self.filler = re.compile(filler) if filler else None
+        self.summary_window = summary_window
+
+    def scenario(self, line):
+        """The scenario of a failure line, None if the line is not one"""
+        match = self.line.match(line)
+        if match is None:
+            return None
+        return match.group(1).strip() or None
+
+    def is_filler(self, line):
+        return self.filler is not None and self.filler.match(line) is not None
+
+    def __repr__(self):
+        return f"ReportFormat({self.name!r})"
+
+BEHAVE = ReportFormat(
+    'behave',
+    markers=("Failing scenarios:", "Failed scenarios:", "Errored scenarios:"),
+    summary=r'\d.*(?:features? passed|scenarios? passed)',
+    line=r'\s*([\w_]+\.feature:\d+.*?)\s*$',
+    # Failure lines of features outside the working directory do not match, but stay in the section
+    filler=r'.*\.feature:',
+)
+CUCUMBER = ReportFormat(
+    'cucumber',
+    markers=("Failed scenarios:",),
+    summary=r'\d+ (?:Scenarios?|Steps?) \(',
+    # Cucumber-JVM prints "classpath:a/b.feature:12 # Name", Cucumber-Ruby "cucumber a/b.feature:12 # Name"
+    line=r'(?:cucumber\s+)?((?:classpath:|file:)?\S+\.feature:\d+\s+#.*?)\s*$',
+)
+PYTEST = ReportFormat(
+    'pytest',
+    markers=("short test summary info",),
+    summary=r'=*\s*\d+ (?:failed|passed|errors?|skipped|deselected|xfailed|xpassed|warnings?)\b.*\bin \d+(?:\.\d+)?s\b',
+    line=r'(?:FAILED|ERROR)\s+(.+?)(?:\s+-\s.*)?$',
+)
+JUNIT = ReportFormat(
+    'junit',
+    markers=("[ERROR] Failures:", "[ERROR] Errors:", "Failed tests:", "Tests in error:"),
+    summary=r'(?:\[(?:ERROR|WARNING|INFO)\]\s+)?Tests run:\s*\d+,\s*Failures:\s*\d+',
+    # Surefire 2.x lists "testName(pkg.Class): message", later versions "[ERROR]   Class.testName:42 message"
+    line=r'(?:\[ERROR\]\s+)?([\w$]+\([\w.$]+\)|[\w$]+(?:\.[\w$]+)+)(?::\d+)?(?:[:\s].*)?$',
+    filler=r'(?:\[(?:ERROR|WARNING|INFO)\]\s*)?(?:Run \d+:.*)?$',
+    # Maven prints its BUILD FAILURE banner and hints below the test summary
+    summary_window=30,
+)
+
+FORMATS = [BEHAVE, CUCUMBER, PYTEST, JUNIT]
+_scanner_memo = {}
+
+def register_format(report_format):
+    """Add a report format to the ones detected in every log.
+
+    Formats registered earlier win when a line matches several. Worker processes
+    import this module afresh, so register formats at import time of a module the
+    workers import as well.
+    """
+    if any(existing.name == report_format.name for existing in FORMATS):
+        raise ValueError(f"a report format named {report_format.name!r} is already registered")
+    FORMATS.append(report_format)
+    _scanner_memo.clear()
+
+def get_format(name):
+    for report_format in FORMATS:
+        if report_format.name == name:
+            return report_format
+    raise KeyError(name)
+
+def format_scanner():
+    """The MarkerScanner of the currently registered formats"""
+    key = tuple(FORMATS)
+    if key not in _scanner_memo:
+        _scanner_memo.clear()
+        _scanner_memo[key] = MarkerScanner(key)
+    return _scanner_memo[key]
+
+class MarkerScanner:
+    """One compiled pattern for the markers and one for the summaries of several formats.
+
+    Every line is checked against all formats at once, so detecting the format of a log
+    costs the same single pass over its tail (or its bytes) whatever the number of formats.
+    Markers shared by several formats (like "Failed scenarios:") are matched once and
+    resolved by the failure lines or the summary that follow.
+    """
+
+    def __init__(self, formats):
+        self.formats = tuple(formats)
+        markers = {}
+        for report_format in self.formats:
+            for marker in report_format.markers:
+                markers.setdefault(marker.lower(), (marker, []))[1].append(report_format)
+        self.markers = [marker for marker, _ in markers.values()]
+        self.marker_formats = [tuple(owners) for _, owners in markers.values()]
+        self.marker_pattern = re.compile('|'.join(f'({re.escape(marker)})' for marker in self.markers), re.IGNORECASE)
+        self.summary_pattern = re.compile('|'.join(
+            f'(?P<f{number}>{report_format.summary.pattern})' for number, report_format in enumerate(self.formats)
+        ))
+        self.trailer_lines = max((report_format.summary_window for report_format in self.formats), default=0)
+        # Changes whenever a format is added or changed, so cached parse results can be invalidated
+        self.signature = hashlib.blake2b(repr([
+            (report_format.name, report_format.markers, report_format.summary.pattern, report_format.line.pattern,
+             report_format.filler and report_format.filler.pattern, report_format.summary_window)
+            for report_format in self.formats
+        ]).encode('utf-8'), digest_size=16).hexdigest()
+
+    def split_marker(self, line):
+        """(formats whose failure section a line opens, text after the marker); ((), line) for other lines.
+
+        Some runners (Surefire 2.x) print the first failure on the marker line itself.
+        """
+        match = self.marker_pattern.search(line)
+        if match is None:
+            return (), line
+        return self.marker_formats[match.lastindex - 1], line[match.end():].strip()
+
+    def summary_format(self, line, position=0):
+        """The format whose summary a line is, None if it is none; position counts non-empty lines from the end"""
+        match = self.summary_pattern.match(line)
+        if match is None:
+            return None
+        report_format = self.formats[int(match.lastgroup[1:])]
+        return report_format if position < report_format.summary_window else None
+
+    def find_summary(self, trailer):
+        """(format, index of the topmost line of its summary block) for the last non-empty lines of a log, newest first.
+
+        The format is the one of the summary line closest to the end; (None, None) without one.
+        """
+        for start, line in enumerate(trailer):
+            report_format = self.summary_format(line, start)
+            if report_format is not None:
+                break
+        else:
+            return None, None
+        while start + 1 < len(trailer) and report_format.summary.match(trailer[start + 1]):
+            start += 1
+        return report_format, start
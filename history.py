@@ -0,0 +1,157 @@
+import os
+import sys
+import time
+import sqlite3
+from datetime import datetime
+import pandas as pd
+from parser import DATE_FORMAT, FAILURE_COLUMNS
+
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+def default_history_path():
+    """Return the per-user location of the failure history database"""
+    if sys.platform == 'win32':
+        base = os.environ.get('APPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'test-failure-analyzer', 'failure_history.sqlite')
+
+def _iso_date(value):
+    # Failure dates are stored as ISO strings (NULL when unknown) so that
+    # comparisons and MIN/MAX in SQL follow calendar order
+    try:
+        return datetime.strptime(value, DATE_FORMAT).strftime(ISO_DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+def _date_filter(since, until):
+    # Unknown dates are left out as soon as a bound is given, as in cli.filter_by_date
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("date >= ?")
+        params.append(since.strftime(ISO_DATE_FORMAT))
+    if until is not None:
+        clauses.append("date <= ?")
+        params.append(until.strftime(ISO_DATE_FORMAT))
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+def _to_datetimes(values):
+    return pd.to_datetime(pd.Series(values, dtype=object), format=ISO_DATE_FORMAT)
+
+class FailureHistory:
+    """SQLite store of every failure ever parsed, one row per failure, kept across sessions.
+
+    Files are keyed by absolute path; recording a file again replaces its failures
+    only when its identity (size, mtime, tail fingerprint) changed. Aggregates are
+    computed by SQLite on the indexed columns, so nothing is loaded into memory
+    beyond the result of the query.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_history_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                id INTEGER PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL,
+                recorded REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS failures (
+                file_id INTEGER NOT NULL REFERENCES files (id),
+                scenario TEXT NOT NULL,
+                date TEXT,
+                filename TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS failures_scenario ON failures (scenario, date);
+            CREATE INDEX IF NOT EXISTS failures_date ON failures (date);
+            CREATE INDEX IF NOT EXISTS failures_filename ON failures (filename);
+            CREATE INDEX IF NOT EXISTS failures_file ON failures (file_id);
+        """)
+        self.conn.commit()
+
+    def record_file(self, filepath, identity, records):
+        """Store the failure records of one parsed file; return False if it was already recorded unchanged"""
+        path = os.path.abspath(filepath)
+        row = self.conn.execute("SELECT id, size, mtime_ns, fingerprint FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None:
+            if tuple(row[1:]) == tuple(identity):
+                return False
+            self.conn.execute("DELETE FROM failures WHERE file_id = ?", (row[0],))
+            self.conn.execute("DELETE FROM files WHERE id = ?", (row[0],))
+
+        size, mtime_ns, fingerprint = identity
+        file_id = self.conn.execute(
+            "INSERT INTO files (path, size, mtime_ns, fingerprint, recorded) VALUES (?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, fingerprint, time.time())
+        ).lastrowid
+        self.conn.executemany(
+            "INSERT INTO failures VALUES (?, ?, ?, ?)",
+            ((file_id, record['Scenario'], _iso_date(record['Date']), record['Filename']) for record in records)
+        )
+        return True
+
+    def commit(self):
+        self.conn.commit()
+
+    def grouped(self, since=None, until=None):
+        """Per-scenario failure count and first/last failure date, shaped like analyzer.group_failures"""
+        where, params = _date_filter(since, until)
+        rows = self.conn.execute(
+            f"SELECT scenario, COUNT(*), MIN(date), MAX(date) FROM failures{where} GROUP BY scenario ORDER BY scenario",
+            params
+        ).fetchall()
+        scenarios, failures, first, last = zip(*rows) if rows else ((), (), (), ())
+        grouped = pd.DataFrame({
+            'Failures': pd.Series(failures, dtype='int64'),
+            'First Failed': _to_datetimes(first),
+            'Last Failed': _to_datetimes(last),
+        })
+        grouped.index = pd.Index(scenarios, dtype=object, name='Scenario')
+        return grouped.sort_values('Failures', ascending=False)
+
+    def failures(self, since=None, until=None):
+        """Every stored failure as a parser.failure_table, in recording order"""
+        where, params = _date_filter(since, until)
+        rows = self.conn.execute(f"SELECT scenario, date, filename FROM failures{where} ORDER BY rowid", params).fetchall()
+        scenarios, dates, filenames = zip(*rows) if rows else ((), (), ())
+        table = pd.DataFrame({'Scenario': scenarios, 'Date': _to_datetimes(dates), 'Filename': filenames}, columns=FAILURE_COLUMNS)
+        return table.astype({'Scenario': 'category', 'Filename': 'category'})
+
+    def scenario_dates(self, since=None, until=None):
+        """Distinct (Scenario, Date) pairs, enough for analyzer.failure_dates_display"""
+        where, params = _date_filter(since, until)
+        rows = self.conn.execute(f"SELECT DISTINCT scenario, date FROM failures{where}", params).fetchall()
+        scenarios, dates = zip(*rows) if rows else ((), ())
+        table = pd.DataFrame({'Scenario': scenarios, 'Date': _to_datetimes(dates)})
+        return table.astype({'Scenario': 'category'})
+
+    def dates(self):
+        """(date, failure count) for every failure date, unknown (None) first, then chronologically"""
+        rows = self.conn.execute("SELECT date, COUNT(*) FROM failures GROUP BY date ORDER BY date").fetchall()
+        return [(None if date is None else pd.Timestamp(date), count) for date, count in rows]
+
+    def failures_on(self, date, text=None):
+        """(scenario, filename) of the failures on one date (None for unknown), optionally only scenarios containing text"""
+        clauses = ["date IS NULL" if date is None else "date = ?"]
+        params = [] if date is None else [date.strftime(ISO_DATE_FORMAT)]
+        if text:
+            # LIKE is case-insensitive for ASCII; escape its wildcards so text matches literally
+            clauses.append("scenario LIKE ? ESCAPE '\\'")
+            params.append('%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        return self.conn.execute(
+            f"SELECT scenario, filename FROM failures WHERE {' AND '.join(clauses)} ORDER BY rowid", params
+        ).fetchall()
+
+    def clear(self):
+        """Forget every recorded file and failure"""
+        self.conn.execute("DELETE FROM failures")
+        self.conn.execute("DELETE FROM files")
+        self.conn.commit()
+        self.conn.execute("VACUUM")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,84 @@
+import io
+import json
+import time
+import pstats
+import cProfile
+
+STAGES = ('cache_lookup', 'encoding_detection', 'scan', 'merge')
+
+class IngestReport:
+    """Per-file ingest statistics and per-stage time totals of one parse_test_results run"""
+
+    def __init__(self):
+        self.files = []
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.started = time.perf_counter()
+        self.wall_seconds = None
+
+    def add_file(self, stats):
+        """Record one file: name, parse path, bytes read, encoding, per-stage seconds, failures, error"""
+        self.files.append(stats)
+        self.stage_seconds['encoding_detection'] += stats.get('encoding_seconds', 0.0)
+        self.stage_seconds['scan'] += stats.get('scan_seconds', 0.0)
+
+    def add_stage_time(self, stage, seconds):
+        self.stage_seconds[stage] += seconds
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self.started
+
+    def slowest_files(self, count=10):
+        return sorted(self.files, key=_file_seconds, reverse=True)[:count]
+
+    def summary(self):
+        """One-line summary for the status bar"""
+        bytes_read = sum(stats.get('bytes_read', 0) for stats in self.files)
+        parts = [f"{self.wall_seconds or 0:.1f}s total"]
+        parts.extend(f"{stage.replace('_', ' ')} {seconds:.1f}s" for stage, seconds in self.stage_seconds.items() if seconds >= 0.05)
+        parts.append(f"{bytes_read / (1024 * 1024):.1f} MB read")
+        slowest = self.slowest_files(1)
+        if slowest:
+            parts.append(f"slowest {slowest[0]['file']} ({_file_seconds(slowest[0]):.1f}s)")
+        return ", ".join(parts)
+
+    def to_dict(self):
+        paths = {}
+        formats = {}
+        for stats in self.files:
+            paths[stats['path']] = paths.get(stats['path'], 0) + 1
+            if 'format' in stats:
+                formats[stats['format']] = formats.get(stats['format'], 0) + 1
+        return {
+            'wall_seconds': self.wall_seconds,
+            'stage_seconds': self.stage_seconds,
+            'files_by_path': paths,
+            'files_by_format': formats,
+            'bytes_read': sum(stats.get('bytes_read', 0) for stats in self.files),
+            'failures': sum(stats.get('failures', 0) for stats in self.files),
+            'files': self.files,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def _file_seconds(stats):
+    return stats.get('encoding_seconds', 0.0) + stats.get('scan_seconds', 0.0)
+
+def run_profiled(profile_path, function, *args, **kwargs):
+    """Run function under cProfile and dump the stats to profile_path (readable with pstats/snakeviz).
+
+    Only the calling process is profiled; with worker processes the parsing itself runs elsewhere,
+    so profile with a single worker to see it.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args, **kwargs)
+    finally:
+        profiler.dump_stats(profile_path)
+
+def top_functions(profile_path, count=20):
+    """Return the cumulative-time top of a dumped profile as text"""
+    output = io.StringIO()
+    pstats.Stats(profile_path, stream=output).sort_stats('cumulative').print_stats(count)
+    return output.getvalue()
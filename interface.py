@@ -1,12 +1,37 @@
-import pandas as pd
+import time
+STARTUP_BEGIN = time.perf_counter()
+
 import os
+import sys
+import queue
+import tempfile
+import importlib
+import threading
 from tkinter import *
-from tkinter import ttk, filedialog, messagebox
-from datetime import datetime
-from parser import parse_test_results, extract_date_from_filename
-from analyzer import group_failures
-from chart_representation import show_chart
-from analyzer import group_failures 
+from tkinter import ttk, filedialog, messagebox, font
+from cache import ParseCache
+from watcher import DirectoryWatcher
+from instrumentation import IngestReport, run_profiled
+from scanner import DEFAULT_INCLUDE
+
+# pandas (through parser/analyzer) and matplotlib (through chart_representation) are
+# imported where they are used so the window shows up before the scientific stack loads.
+# pandas is warmed up on a background thread right after startup; matplotlib only
+# loads on the first "Show Chart".
+WARM_UP_MODULES = ('pandas', 'parser', 'analyzer')
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+ANALYSIS_POLL_MS = 100
+RESULTS_REFRESH_SECONDS = 0.5
+WATCH_INTERVAL_MS = 5000
+RESULT_COLUMNS = ('Scenario', 'Failures', 'First Failed', 'Last Failed')
+# Same names as trends.TREND_COLUMNS, repeated so startup does not import pandas
+TREND_RESULT_COLUMNS = ('Failure Rate', 'Recent Failures', 'Current Streak', 'Longest Streak', 'Flakiness')
+# Labels for exporter.EXPORT_VIEWS and exporter.EXPORT_FORMATS
+EXPORT_VIEW_LABELS = {'Grouped by scenario': 'grouped', 'Raw failures': 'raw', 'Per date': 'per-date'}
+EXPORT_FORMAT_LABELS = {'CSV': 'csv', 'JSON Lines': 'json', 'Parquet': 'parquet'}
+RAW_DATA_FONT = ('Courier', 10)
+RAW_HEADER_LINES = 4
 
 
 class TestFailureAnalyzer:
@@ -15,8 +40,33 @@ class TestFailureAnalyzer:
         self.root.title("Test Failure Analyzer")
         self.root.geometry("1000x700")
 
-        self.failure_data = pd.DataFrame(columns=['Scenario', 'Date', 'Filename'])
+        self.failure_data = None
+        self.parse_cache = None
+        self.failure_history = None
+        self.analysis_thread = None
+        self.analysis_queue = queue.Queue()
+        self.cancel_event = None
+        self.pending_records = []
+        self.watcher = None
+        self.watch_snapshot = None
+        self.watch_job = None
+        self.watch_queue = queue.Queue()
+        self.ingest_report = None
+        self.grouped = None
+        self.runs = []
+        self.trend_index = None
+        self.dates_display = None
+        self.date_index = None
+        self.chart = None
+        self.export_thread = None
+        self.export_queue = queue.Queue()
+        self.results_offset = 0
+        self.selected_scenario = None
+        self.sort_column = None
+        self.sort_ascending = True
         self.create_widgets()
+        self.root.after_idle(self.report_startup_time)
+        self.root.after_idle(self.start_warm_up)
 
     def create_widgets(self):
         # Control Frame
@@ -32,32 +82,75 @@ class TestFailureAnalyzer:
         # Parse options
         self.reverse_parse = BooleanVar(value=True)
         Checkbutton(control_frame, text="Parse from end (for large files)", variable=self.reverse_parse).grid(row=1, column=0, sticky=W)
+        Label(control_frame, text="Worker processes:").grid(row=1, column=1, sticky=E)
+        self.workers = IntVar(value=DEFAULT_WORKERS)
+        Spinbox(control_frame, from_=1, to=max(DEFAULT_WORKERS * 2, 1), width=5, textvariable=self.workers).grid(row=1, column=2, sticky=W)
+        self.use_cache = BooleanVar(value=True)
+        Checkbutton(control_frame, text="Use parse cache", variable=self.use_cache).grid(row=1, column=3, sticky=W)
+        self.watch_enabled = BooleanVar(value=False)
+        Checkbutton(control_frame, text="Watch for new files", variable=self.watch_enabled, command=self.toggle_watch).grid(row=1, column=4, sticky=W)
+
+        # File selection options
+        self.recursive = BooleanVar(value=False)
+        Checkbutton(control_frame, text="Include subfolders", variable=self.recursive).grid(row=2, column=0, sticky=W)
+        Label(control_frame, text="Include:").grid(row=2, column=1, sticky=E)
+        self.include_entry = Entry(control_frame, width=30)
+        self.include_entry.insert(0, " ".join(DEFAULT_INCLUDE))
+        self.include_entry.grid(row=2, column=2, columnspan=2, sticky=W)
+        Label(control_frame, text="Exclude:").grid(row=2, column=4, sticky=E)
+        self.exclude_entry = Entry(control_frame, width=20)
+        self.exclude_entry.grid(row=2, column=5, columnspan=2, sticky=W)
 
         # Action Buttons
-        Button(control_frame, text="Analyze Files", command=self.analyze_files).grid(row=2, column=0, pady=10)
-        Button(control_frame, text="Export to CSV", command=self.export_to_csv).grid(row=2, column=1, pady=10)
-        Button(control_frame, text="Show Chart", command=self.show_chart).grid(row=2, column=2, pady=10)
-        Button(control_frame, text="Show Failure Dates", command=self.show_failure_dates).grid(row=2, column=3, pady=10)
-        Button(control_frame, text="View Text Files Data", command=self.show_raw_data).grid(row=2, column=4, pady=10)
+        self.analyze_button = Button(control_frame, text="Analyze Files", command=self.analyze_files)
+        self.analyze_button.grid(row=3, column=0, pady=10)
+        Button(control_frame, text="Export Data", command=self.export_data).grid(row=3, column=1, pady=10)
+        Button(control_frame, text="Show Chart", command=self.show_chart).grid(row=3, column=2, pady=10)
+        Button(control_frame, text="Show Failure Dates", command=self.show_failure_dates).grid(row=3, column=3, pady=10)
+        Button(control_frame, text="View Text Files Data", command=self.show_raw_data).grid(row=3, column=4, pady=10)
+        Button(control_frame, text="Rebuild Cache", command=self.rebuild_cache).grid(row=3, column=5, pady=10)
+        self.cancel_button = Button(control_frame, text="Cancel", command=self.cancel_analysis, state=DISABLED)
+        self.cancel_button.grid(row=3, column=6, pady=10)
+        Button(control_frame, text="Export Timing Report", command=self.export_timing_report).grid(row=4, column=0, pady=(0, 10))
+        self.profile_next_run = BooleanVar(value=False)
+        Checkbutton(control_frame, text="Profile next run (cProfile)", variable=self.profile_next_run).grid(row=4, column=1, sticky=W)
+        self.record_history = BooleanVar(value=False)
+        Checkbutton(control_frame, text="Record failure history", variable=self.record_history).grid(row=4, column=2, sticky=W)
+        Button(control_frame, text="Show History", command=self.show_history).grid(row=4, column=3, pady=(0, 10))
         # Results Frame
         results_frame = Frame(self.root)
         results_frame.pack(fill=BOTH, expand=True, padx=10, pady=10)
 
-        # Treeview for results
-        self.tree = ttk.Treeview(results_frame, columns=('Scenario', 'Failures', 'First Failed', 'Last Failed'), show='headings')
-        self.tree.heading('Scenario', text='Scenario')
-        self.tree.heading('Failures', text='Failure Count')
-        self.tree.heading('First Failed', text='First Failure Date')
-        self.tree.heading('Last Failed', text='Last Failure Date')
+        # Treeview for results. Only the visible window of rows exists as tree items;
+        # scrolling re-renders that window from self.grouped
+        self.tree = ttk.Treeview(results_frame, columns=RESULT_COLUMNS + TREND_RESULT_COLUMNS, show='headings')
+        self.tree.heading('Scenario', text='Scenario', command=lambda: self.sort_results('Scenario'))
+        self.tree.heading('Failures', text='Failure Count', command=lambda: self.sort_results('Failures'))
+        self.tree.heading('First Failed', text='First Failure Date', command=lambda: self.sort_results('First Failed'))
+        self.tree.heading('Last Failed', text='Last Failure Date', command=lambda: self.sort_results('Last Failed'))
         self.tree.column('Scenario', width=400)
         self.tree.column('Failures', width=100, anchor=CENTER)
         self.tree.column('First Failed', width=150, anchor=CENTER)
         self.tree.column('Last Failed', width=150, anchor=CENTER)
+        for column in TREND_RESULT_COLUMNS:
+            self.tree.heading(column, text=column, command=lambda column=column: self.sort_results(column))
+            self.tree.column(column, width=90, anchor=CENTER)
 
-        scrollbar = ttk.Scrollbar(results_frame, orient=VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.results_scrollbar = ttk.Scrollbar(results_frame, orient=VERTICAL, command=self.scroll_results)
         self.tree.grid(row=0, column=0, sticky=NSEW)
-        scrollbar.grid(row=0, column=1, sticky=NS)
+        self.results_scrollbar.grid(row=0, column=1, sticky=NS)
+        self.tree.bind('<Configure>', lambda event: self.render_results())
+        self.tree.bind('<MouseWheel>', lambda event: self.scroll_results('scroll', -1 if event.delta > 0 else 1, 'units'))
+        self.tree.bind('<Button-4>', lambda event: self.scroll_results('scroll', -1, 'units'))
+        self.tree.bind('<Button-5>', lambda event: self.scroll_results('scroll', 1, 'units'))
+        # Only the visible rows exist as tree items, so the keys move through self.grouped instead
+        self.tree.bind('<Up>', lambda event: self.move_result_selection(-1, 'units'))
+        self.tree.bind('<Down>', lambda event: self.move_result_selection(1, 'units'))
+        self.tree.bind('<Prior>', lambda event: self.move_result_selection(-1, 'pages'))
+        self.tree.bind('<Next>', lambda event: self.move_result_selection(1, 'pages'))
+        self.tree.bind('<<TreeviewSelect>>', self.remember_selection)
+        # Double-click a scenario for its own failure trend
+        self.tree.bind('<Double-1>', self.drill_down)
 
         # Configure grid weights
         results_frame.grid_rowconfigure(0, weight=1)
@@ -68,6 +161,39 @@ class TestFailureAnalyzer:
         self.status.set("Ready")
         Label(self.root, textvariable=self.status, bd=1, relief=SUNKEN, anchor=W).pack(fill=X)
 
+    def report_startup_time(self):
+        self.startup_seconds = time.perf_counter() - STARTUP_BEGIN
+        self.status.set(f"Ready (started in {self.startup_seconds:.2f}s)")
+        if '--startup-time' in sys.argv:
+            print(f"Startup time: {self.startup_seconds:.3f}s")
+            self.root.destroy()
+
+    def start_warm_up(self):
+        def warm_up():
+            for module in WARM_UP_MODULES:
+                importlib.import_module(module)
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    def has_failure_data(self):
+        return self.failure_data is not None and not self.failure_data.empty
+
+    def failure_dates(self):
+        """Per-scenario failure dates display, recomputed only when failure_data is replaced"""
+        from analyzer import failure_dates_display
+
+        # failure_data is never modified in place, every change assigns a new table
+        if self.dates_display is None or self.dates_display[0] is not self.failure_data:
+            self.dates_display = (self.failure_data, failure_dates_display(self.failure_data))
+        return self.dates_display[1]
+
+    def failure_date_index(self):
+        """Date-sorted failure table and its date -> row range index, rebuilt only when failure_data is replaced"""
+        from analyzer import index_by_date
+
+        if self.date_index is None or self.date_index[0] is not self.failure_data:
+            self.date_index = (self.failure_data,) + index_by_date(self.failure_data)
+        return self.date_index[1:]
+
     def browse_directory(self):
         directory = filedialog.askdirectory()
         if directory:
@@ -79,96 +205,522 @@ class TestFailureAnalyzer:
         if not directory or not os.path.exists(directory):
             messagebox.showerror("Error", "Please select a valid directory")
             return
+        if self.analysis_thread is not None and self.analysis_thread.is_alive():
+            return
 
         self.status.set("Analyzing files...")
-        self.root.update()
+        self.failure_data = None
+        self.runs = []
+        self.trend_index = None
+        self.display_results()
+        self.pending_records = []
+        self.last_refresh = 0
+        self.analysis_start = time.monotonic()
+        self.cancel_event = threading.Event()
+        self.analyze_button.config(state=DISABLED)
+        self.cancel_button.config(state=NORMAL)
+        self.stop_watch()
+        self.watch_queue = queue.Queue()
+
+        # Snapshot before parsing so files that change during the run are picked up by the watcher
+        scan_options = {
+            'recursive': self.recursive.get(),
+            'include': self.include_entry.get().split() or None,
+            'exclude': self.exclude_entry.get().split() or None
+        }
+        self.watcher = DirectoryWatcher(directory, **scan_options)
+        self.watch_snapshot = self.watcher.snapshot()
+        self.analysis_options = (directory, self.reverse_parse.get(), self.workers.get(), scan_options)
+
+        cache = self.get_parse_cache() if self.use_cache.get() else None
+        history = self.get_failure_history() if self.record_history.get() else None
+        self.ingest_report = IngestReport()
+        profile_path = None
+        if self.profile_next_run.get():
+            # Profiling is switched on for this run only
+            self.profile_next_run.set(False)
+            profile_path = os.path.join(tempfile.gettempdir(), f"test-failure-analyzer-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        self.analysis_thread = threading.Thread(
+            target=self.run_analysis,
+            args=self.analysis_options + (cache, history, self.ingest_report, profile_path),
+            daemon=True
+        )
+        self.analysis_thread.start()
+        self.root.after(ANALYSIS_POLL_MS, self.poll_analysis)
+
+    def run_analysis(self, directory, reverse_parse, workers, scan_options, cache, history, report, profile_path):
+        """Runs on the worker thread; all results go back to Tk through the queue"""
+        from parser import parse_test_results
+
+        def progress(filename, records, files_done, total_files, bytes_done, total_bytes):
+            self.analysis_queue.put(('progress', (records, files_done, total_files, bytes_done, total_bytes)))
 
         try:
-            self.failure_data = parse_test_results(directory, self.reverse_parse.get())
-            self.display_results()
-            self.status.set(f"Analysis complete. Found {len(self.failure_data)} failures across {len(self.failure_data['Filename'].unique())} files")
+            errors = []
+            runs = []
+            args = (directory, reverse_parse, workers, errors, cache, progress, self.cancel_event)
+            kwargs = dict(scan_options, report=report, history=history, runs=runs)
+            if profile_path:
+                failure_data = run_profiled(profile_path, parse_test_results, *args, **kwargs)
+            else:
+                failure_data = parse_test_results(*args, **kwargs)
+            self.analysis_queue.put(('done', (failure_data, errors, runs, profile_path)))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to analyze files: {str(e)}")
+            self.analysis_queue.put(('error', e))
+
+    def poll_analysis(self):
+        from parser import failure_table, concat_failure_tables
+
+        finished = None
+        while True:
+            try:
+                kind, payload = self.analysis_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                records, files_done, total_files, bytes_done, total_bytes = payload
+                self.pending_records.extend(records)
+                self.status.set(self.format_progress(files_done, total_files, bytes_done, total_bytes))
+            else:
+                finished = (kind, payload)
+
+        if finished is not None:
+            self.finish_analysis(*finished)
+            return
+
+        # Fill the results view in batches rather than on every file
+        now = time.monotonic()
+        if self.pending_records and now - self.last_refresh >= RESULTS_REFRESH_SECONDS:
+            batch = failure_table(self.pending_records)
+            if self.failure_data is None:
+                self.failure_data = batch
+            else:
+                self.failure_data = concat_failure_tables([self.failure_data, batch])
+            self.pending_records = []
+            self.last_refresh = now
+            self.display_results()
+        self.root.after(ANALYSIS_POLL_MS, self.poll_analysis)
+
+    def format_progress(self, files_done, total_files, bytes_done, total_bytes):
+        elapsed = time.monotonic() - self.analysis_start
+        message = f"Analyzing files... {files_done}/{total_files} files, {bytes_done / (1024 * 1024):.1f} MB read"
+        if 0 < bytes_done < total_bytes:
+            eta = elapsed * (total_bytes - bytes_done) / bytes_done
+            message += f", ETA {int(eta) // 60}m {int(eta) % 60:02d}s"
+        return message
+
+    def finish_analysis(self, kind, payload):
+        self.analyze_button.config(state=NORMAL)
+        self.cancel_button.config(state=DISABLED)
+        self.pending_records = []
+
+        if kind == 'error':
+            messagebox.showerror("Error", f"Failed to analyze files: {str(payload)}")
             self.status.set("Error occurred during analysis")
+            return
 
-    def display_results(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.failure_data, errors, self.runs, profile_path = payload
+        self.update_trends()
+        self.display_results()
+        summary = f"Found {len(self.failure_data)} failures across {len(self.failure_data['Filename'].unique())} files"
+        if self.cancel_event.is_set():
+            self.status.set(f"Analysis cancelled. {summary}")
+            self.watcher = None
+        else:
+            self.status.set(f"Analysis complete. {summary} ({self.ingest_report.summary()})")
+            self.watcher.mark_processed(self.watch_snapshot)
+            if self.watch_enabled.get():
+                self.schedule_watch()
+        if errors:
+            self.show_parse_errors(errors)
+        if profile_path:
+            messagebox.showinfo("Profile", f"cProfile statistics saved to {profile_path}")
+
+    def export_timing_report(self):
+        if self.ingest_report is None or self.ingest_report.wall_seconds is None:
+            messagebox.showwarning("Warning", "Run an analysis first")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if file_path:
+            try:
+                self.ingest_report.write_json(file_path)
+                messagebox.showinfo("Success", f"Timing report exported to {file_path}")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export: {str(e)}")
+
+    def toggle_watch(self):
+        if not self.watch_enabled.get():
+            self.stop_watch()
+        elif self.watcher is None:
+            # Watching starts from a complete analysis
+            self.analyze_files()
+        elif self.analysis_thread is None or not self.analysis_thread.is_alive():
+            self.schedule_watch()
+
+    def schedule_watch(self):
+        if self.watch_job is None:
+            self.watch_job = self.root.after(WATCH_INTERVAL_MS, self.poll_watch)
+
+    def stop_watch(self):
+        if self.watch_job is not None:
+            self.root.after_cancel(self.watch_job)
+            self.watch_job = None
+
+    def poll_watch(self):
+        """Apply finished watch batches, then look for new or updated files to parse"""
+        self.watch_job = None
+        if not self.watch_enabled.get() or self.watcher is None:
+            return
 
-        if self.failure_data.empty:
+        while True:
+            try:
+                batch, errors, runs = self.watch_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.apply_watch_batch(batch, errors, runs)
+
+        if self.analysis_thread is None or not self.analysis_thread.is_alive():
+            try:
+                ready, removed = self.watcher.poll()
+            except OSError as e:
+                self.status.set(f"Watch stopped: {str(e)}")
+                self.watch_enabled.set(False)
+                return
+            if ready or removed:
+                self.start_watch_batch(ready, removed)
+        self.schedule_watch()
+
+    def start_watch_batch(self, ready, removed):
+        from analyzer import drop_files
+
+        # Updated files replace their earlier failures, deleted files just lose them
+        stale = [os.path.relpath(path, self.watcher.directory) for path in ready + removed]
+        if self.has_failure_data() and self.failure_data['Filename'].isin(stale).any():
+            self.failure_data, self.grouped = drop_files(self.failure_data, self.grouped, stale)
+            self.runs = [run for run in self.runs if run[0] not in stale]
+            self.update_trends()
+            self.refresh_grouped()
+        if not ready:
             return
 
-        grouped = group_failures(self.failure_data)
-        for scenario, row in grouped.iterrows():
-            self.tree.insert('', 'end', values=(
-                scenario,
-                row['Failures'],
-                row['First Failed'],
-                row['Last Failed']
-            ))
+        directory, reverse_parse, workers, _ = self.analysis_options
+        cache = self.get_parse_cache() if self.use_cache.get() else None
+        history = self.get_failure_history() if self.record_history.get() else None
+        self.status.set(f"Watching: parsing {len(ready)} new file(s)...")
+        self.analysis_thread = threading.Thread(
+            target=self.run_watch_batch,
+            args=(directory, reverse_parse, workers, cache, history, ready),
+            daemon=True
+        )
+        self.analysis_thread.start()
 
+    def run_watch_batch(self, directory, reverse_parse, workers, cache, history, files):
+        """Runs on the worker thread; the parsed batch goes back to Tk through the watch queue"""
+        from parser import parse_test_results, failure_table
 
-    def export_to_csv(self):
-        if self.failure_data.empty:
-            messagebox.showwarning("Warning", "No data to export")
+        errors = []
+        runs = []
+        try:
+            batch = parse_test_results(directory, reverse_parse, workers, errors, cache, files=files, history=history, runs=runs)
+        except Exception as e:
+            batch = failure_table([])
+            errors.append((directory, str(e)))
+        self.watch_queue.put((batch, errors, runs))
+
+    def apply_watch_batch(self, batch, errors, runs):
+        """Merge a parsed batch into the failure table, the grouped view and the trends without regrouping everything"""
+        from analyzer import group_failures, merge_grouped
+        from parser import concat_failure_tables
+
+        self.runs.extend(runs)
+        if not batch.empty:
+            if self.failure_data is None:
+                self.failure_data = batch
+            else:
+                self.failure_data = concat_failure_tables([self.failure_data, batch])
+            batch_grouped = group_failures(batch)
+            self.grouped = batch_grouped if self.grouped is None else merge_grouped(self.grouped, batch_grouped)
+        if runs or not batch.empty:
+            # Passing runs change the trends too, even without new failures
+            self.update_trends(batch, runs)
+            self.refresh_grouped()
+        files = len(batch['Filename'].unique())
+        self.status.set(f"Watching: added {len(batch)} failures from {files} file(s), {len(self.failure_data) if self.failure_data is not None else 0} in total")
+        if errors:
+            self.show_parse_errors(errors)
+
+    def update_trends(self, batch=None, runs=()):
+        """Fold new runs into the trend index, or rebuild it when they are not the newest"""
+        from trends import TrendIndex
+
+        if self.failure_data is None:
+            self.trend_index = None
+            return
+        run_dates = [date for _, date in runs]
+        if self.trend_index is not None and batch is not None and self.trend_index.can_add(batch, run_dates):
+            self.trend_index.add_runs(batch, run_dates)
+        else:
+            self.trend_index = TrendIndex.build(self.failure_data, [date for _, date in self.runs])
+
+    def refresh_grouped(self):
+        from trends import add_trend_columns
+
+        if self.grouped is not None and self.trend_index is not None:
+            self.grouped = add_trend_columns(self.grouped, self.trend_index)
+        if self.grouped is not None and self.sort_column is not None:
+            self.grouped = self.sort_grouped(self.grouped, self.sort_column, self.sort_ascending)
+        self.render_results()
+
+    def cancel_analysis(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.status.set("Cancelling analysis...")
+
+    def get_parse_cache(self):
+        if self.parse_cache is None:
+            self.parse_cache = ParseCache()
+        return self.parse_cache
+
+    def get_failure_history(self):
+        from history import FailureHistory
+
+        if self.failure_history is None:
+            self.failure_history = FailureHistory()
+        return self.failure_history
+
+    def rebuild_cache(self):
+        if self.analysis_thread is not None and self.analysis_thread.is_alive():
+            messagebox.showwarning("Warning", "Wait for the current analysis to finish")
             return
-        
         try:
-            # Get the grouped data while preserving full scenario names
-            grouped_data = group_failures(self.failure_data)
-            
-            # Reset index to include Scenario as a column (if it's the index)
-            if grouped_data.index.name == 'Scenario':
-                grouped_data = grouped_data.reset_index()
-            
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-            )
-            
-            if file_path:
-                # Ensure we're exporting the full scenario names
-                grouped_data.to_csv(file_path, index=False)
-                
-                # Verify the output
-                print("\nCSV Export Preview:")
-                print(grouped_data.head().to_string(index=False))
-                
-                messagebox.showinfo("Success", f"Data exported to {file_path}")
-                
+            self.get_parse_cache().clear()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+            messagebox.showerror("Error", f"Failed to clear cache: {str(e)}")
+            return
+        self.status.set("Parse cache cleared")
+        if self.dir_entry.get():
+            self.analyze_files()
 
-    def group_failures(self, failure_data):
-        """Group the failure data while preserving full scenario names"""
-        if failure_data.empty:
-            return pd.DataFrame()
-        
-        # Group and aggregate while keeping scenario as a column
-        grouped = (
-            failure_data
-            .groupby('Scenario', as_index=False)
-            .agg(
-                Failures=('Date', 'count'),
-                First_Failed=('Date', 'min'),
-                Last_Failed=('Date', 'max')
-            )
-            .sort_values('Failures', ascending=False)
+    def show_parse_errors(self, errors):
+        details = "\n".join(f"{filename}: {message}" for filename, message in errors[:20])
+        if len(errors) > 20:
+            details += f"\n... and {len(errors) - 20} more"
+        messagebox.showwarning("Warning", f"{len(errors)} file(s) could not be parsed:\n\n{details}")
+
+    def display_results(self):
+        from analyzer import group_failures
+        from trends import add_trend_columns
+
+        if not self.has_failure_data():
+            self.grouped = None
+        else:
+            self.grouped = group_failures(self.failure_data)
+            if self.trend_index is not None:
+                self.grouped = add_trend_columns(self.grouped, self.trend_index)
+            if self.sort_column is not None:
+                self.grouped = self.sort_grouped(self.grouped, self.sort_column, self.sort_ascending)
+        self.render_results()
+
+    def sort_grouped(self, grouped, column, ascending):
+        if column == 'Scenario':
+            return grouped.sort_index(ascending=ascending)
+        if column not in grouped.columns:
+            # Trend columns only exist once the analysis is done; the sort applies then
+            return grouped
+        return grouped.sort_values(column, ascending=ascending)
+
+    def sort_results(self, column):
+        if self.sort_column == column:
+            self.sort_ascending = not self.sort_ascending
+        else:
+            self.sort_column = column
+            # Dates and names start ascending, counts and rates with the highest first
+            self.sort_ascending = column in ('Scenario', 'First Failed', 'Last Failed')
+        if self.grouped is not None:
+            self.grouped = self.sort_grouped(self.grouped, column, self.sort_ascending)
+        self.results_offset = 0
+        self.render_results()
+
+    def visible_result_rows(self):
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        return max(1, (self.tree.winfo_height() - row_height) // row_height)
+
+    def scroll_results(self, action, amount, unit=None):
+        total = 0 if self.grouped is None else len(self.grouped)
+        page = self.visible_result_rows()
+        if action == 'moveto':
+            self.results_offset = int(float(amount) * total)
+        elif unit == 'pages':
+            self.results_offset += int(amount) * page
+        else:
+            self.results_offset += int(amount)
+        self.results_offset = max(0, min(self.results_offset, total - page))
+        self.render_results()
+
+    def remember_selection(self, event):
+        # Items are reused for other scenarios when scrolling, so the selection is kept by scenario
+        selection = self.tree.selection()
+        if selection:
+            self.selected_scenario = self.tree.item(selection[0], 'values')[0]
+
+    def move_result_selection(self, amount, unit):
+        """Move the selected scenario by rows or pages, scrolling to keep it visible; without one, just scroll"""
+        total = 0 if self.grouped is None else len(self.grouped)
+        if not total or self.selected_scenario not in self.grouped.index:
+            self.scroll_results('scroll', amount, unit)
+            return 'break'
+        page = self.visible_result_rows()
+        position = self.grouped.index.get_loc(self.selected_scenario) + amount * (page if unit == 'pages' else 1)
+        position = max(0, min(position, total - 1))
+        self.selected_scenario = self.grouped.index[position]
+        if position < self.results_offset:
+            self.results_offset = position
+        elif position >= self.results_offset + page:
+            self.results_offset = position - page + 1
+        self.render_results()
+        return 'break'
+
+    def render_results(self):
+        """Show the slice of self.grouped at the current offset, reusing existing tree items"""
+        from parser import format_date
+
+        total = 0 if self.grouped is None else len(self.grouped)
+        page = self.visible_result_rows()
+        self.results_offset = max(0, min(self.results_offset, total - page))
+        rows = [] if self.grouped is None else self.grouped.iloc[self.results_offset:self.results_offset + page]
+
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+            items = items[:len(rows)]
+        for i, (scenario, failures, first_failed, last_failed, *trend) in enumerate(
+            [] if self.grouped is None else rows.itertuples(name=None)
+        ):
+            values = (scenario, failures, format_date(first_failed), format_date(last_failed))
+            if trend:
+                failure_rate, recent, current_streak, longest_streak, flakiness = trend
+                window = min(self.trend_index.window, len(self.trend_index.run_dates))
+                values += (f"{failure_rate:.0%}", f"{recent}/{window}", current_streak, longest_streak, f"{flakiness:.2f}")
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert('', 'end', values=values)
+
+        # Keep the selection on its scenario rather than on the reused row slot
+        visible = [] if self.grouped is None else rows.index
+        selected = [item for item, scenario in zip(self.tree.get_children(), visible) if scenario == self.selected_scenario]
+        if selected:
+            self.tree.selection_set(selected)
+            self.tree.focus(selected[0])
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if total:
+            self.results_scrollbar.set(self.results_offset / total, min(1.0, (self.results_offset + page) / total))
+        else:
+            self.results_scrollbar.set(0.0, 1.0)
+
+    def export_data(self):
+        if not self.has_failure_data():
+            messagebox.showwarning("Warning", "No data to export")
+            return
+        if self.export_thread is not None and self.export_thread.is_alive():
+            messagebox.showwarning("Warning", "Wait for the current export to finish")
+            return
+
+        dialog = Toplevel(self.root)
+        dialog.title("Export Data")
+        view = StringVar(value=next(iter(EXPORT_VIEW_LABELS)))
+        output_format = StringVar(value=next(iter(EXPORT_FORMAT_LABELS)))
+        Label(dialog, text="View:").grid(row=0, column=0, sticky=W, padx=10, pady=5)
+        OptionMenu(dialog, view, *EXPORT_VIEW_LABELS).grid(row=0, column=1, sticky=EW, padx=10, pady=5)
+        Label(dialog, text="Format:").grid(row=1, column=0, sticky=W, padx=10, pady=5)
+        OptionMenu(dialog, output_format, *EXPORT_FORMAT_LABELS).grid(row=1, column=1, sticky=EW, padx=10, pady=5)
+        Button(dialog, text="Export...", command=lambda: self.start_export(
+            dialog, EXPORT_VIEW_LABELS[view.get()], EXPORT_FORMAT_LABELS[output_format.get()]
+        )).grid(row=2, column=0, columnspan=2, pady=10)
+
+    def start_export(self, dialog, view, output_format):
+        from exporter import EXTENSIONS
+
+        extension = EXTENSIONS[output_format]
+        file_path = filedialog.asksaveasfilename(
+            parent=dialog,
+            defaultextension=extension,
+            filetypes=[(f"{output_format.upper()} files", f"*{extension}"), ("All files", "*.*")]
         )
-        
-        # Rename columns to match display
-        grouped = grouped.rename(columns={
-            'First_Failed': 'First Failed',
-            'Last_Failed': 'Last Failed'
-        })
-        
-        return grouped
+        if not file_path:
+            return
+        dialog.destroy()
+
+        # The tables are never modified in place, so the thread can keep using these
+        # even if an analysis or watch batch replaces them meanwhile. The grouped view
+        # reuses self.grouped, as displayed (sort order and trend columns included)
+        grouped = self.grouped if view == 'grouped' else None
+        self.export_queue = queue.Queue()
+        self.export_thread = threading.Thread(
+            target=self.run_export,
+            args=(file_path, output_format, view, self.failure_data, grouped),
+            daemon=True
+        )
+        self.status.set(f"Exporting {view} data to {file_path}...")
+        self.export_thread.start()
+        self.root.after(ANALYSIS_POLL_MS, self.poll_export)
+
+    def run_export(self, file_path, output_format, view, failure_data, grouped):
+        """Runs on the export thread; progress goes back to Tk through the export queue"""
+        from exporter import export_view
+
+        def progress(rows_done, total_rows):
+            self.export_queue.put(('progress', (rows_done, total_rows)))
+
+        try:
+            rows = export_view(file_path, output_format, view, failure_data, grouped, progress)
+            self.export_queue.put(('done', (file_path, rows)))
+        except Exception as e:
+            self.export_queue.put(('error', e))
+
+    def poll_export(self):
+        while True:
+            try:
+                kind, payload = self.export_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                rows_done, total_rows = payload
+                self.status.set(f"Exporting... {rows_done}/{total_rows} rows")
+            elif kind == 'done':
+                file_path, rows = payload
+                self.status.set(f"Exported {rows} rows to {file_path}")
+                messagebox.showinfo("Success", f"Data exported to {file_path}")
+                return
+            else:
+                self.status.set("Export failed")
+                messagebox.showerror("Error", f"Failed to export: {str(payload)}")
+                return
+        self.root.after(ANALYSIS_POLL_MS, self.poll_export)
+
+    def show_chart(self, scenario=None):
+        if not self.has_failure_data():
+            # Checked here too so matplotlib is not loaded just to show the warning
+            messagebox.showwarning("Warning", "No data to visualize")
+            return
 
-    def show_chart(self):
-        show_chart(self.root, self.failure_data)
+        from chart_representation import show_chart
+
+        # An open chart window is reused and only redrawn
+        self.chart = show_chart(self.root, self.failure_data, self.chart, scenario)
+
+    def drill_down(self, event):
+        item = self.tree.identify_row(event.y)
+        if item:
+            self.show_chart(self.tree.item(item, 'values')[0])
 
     def show_failure_dates(self):
-        if self.failure_data.empty:
+        if not self.has_failure_data():
             messagebox.showwarning("Warning", "No failure data available")
             return
 
@@ -207,48 +759,25 @@ class TestFailureAnalyzer:
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
 
-        # Group data by scenario and process dates
-        grouped = self.failure_data.groupby('Scenario')['Date'].agg(list)
-
         # Add data to treeview
-        for scenario, dates in grouped.items():
-            unique_dates = sorted(set(dates))  # Remove duplicates and sort
-
-            # Extract years from all dates
-            years = set()
-            date_objects = []
-            for date_str in unique_dates:
-                try:
-                    date_obj = datetime.strptime(date_str, "%d %B %Y")
-                    years.add(date_obj.year)
-                    date_objects.append(date_obj)
-                except ValueError:
-                    # Handle unknown_date or other formats
-                    pass
-
-            if len(years) == 1 and len(date_objects) > 1:
-                # All dates same year - format without repeating year
-                year = years.pop()
-                formatted_dates = []
-                for date_obj in sorted(date_objects):
-                    # Format as "Day Month" (without year)
-                    formatted_dates.append(date_obj.strftime("%d %B"))
-                # Add year once at the end
-                date_display = ", ".join(formatted_dates) + f" {year}"
-            else:
-                # Mixed years or single date - show full dates
-                date_display = ", ".join(unique_dates)
-
+        for scenario, date_display in self.failure_dates().items():
             tree.insert('', 'end', values=(scenario, date_display))
 
         # Add close button (placed below the horizontal scrollbar)
         Button(dates_window, text="Close", command=dates_window.destroy).grid(row=2, column=0, pady=10)
 
     def show_raw_data(self):
-        if self.failure_data.empty:
+        from parser import format_date, UNKNOWN_DATE
+
+        if not self.has_failure_data():
             messagebox.showwarning("Warning", "No data available")
             return
         
+        # Sorted table and date index are shared by every filter change
+        self.raw_data, self.raw_ranges = self.failure_date_index()
+        self.raw_rows = range(len(self.raw_data))
+        self.raw_offset = 0
+        
         # Create new window
         raw_window = Toplevel(self.root)
         raw_window.title("Test Failure Data Viewer")
@@ -258,12 +787,11 @@ class TestFailureAnalyzer:
         control_frame = Frame(raw_window)
         control_frame.pack(fill=X, padx=10, pady=5)
         
-        # Get unique dates and sort them chronologically
-        unique_dates = sorted(
-            set(self.failure_data['Date']), 
-            key=lambda x: datetime.strptime(x, "%d %B %Y") if x != "unknown_date" else datetime.min
-        )
-        unique_dates.insert(0, "All Dates")
+        # Date options follow the index order: unknown dates first, then chronologically
+        self.date_options = {
+            UNKNOWN_DATE if date is None else format_date(date): date for date in self.raw_ranges
+        }
+        unique_dates = ["All Dates"] + list(self.date_options)
         
         # Date selection dropdown
         Label(control_frame, text="Filter by Date:").pack(side=LEFT, padx=5)
@@ -272,27 +800,33 @@ class TestFailureAnalyzer:
         date_dropdown.pack(side=LEFT, padx=5)
         date_dropdown.config(width=15)
         
+        # Scenario substring filter
+        Label(control_frame, text="Scenario contains:").pack(side=LEFT, padx=5)
+        self.scenario_filter = StringVar()
+        Entry(control_frame, textvariable=self.scenario_filter, width=40).pack(side=LEFT, padx=5)
+        
         # Create text display area
         text_frame = Frame(raw_window)
         text_frame.pack(fill=BOTH, expand=True, padx=10, pady=5)
         
-        # Add scrollbars
-        y_scroll = Scrollbar(text_frame)
+        # Add scrollbars. The text only holds the visible page of rows, so the
+        # vertical scrollbar moves through self.raw_rows rather than the text
+        y_scroll = ttk.Scrollbar(text_frame, orient=VERTICAL, command=self.scroll_raw_data)
         x_scroll = Scrollbar(text_frame, orient=HORIZONTAL)
+        self.raw_data_scrollbar = y_scroll
         
         # Create text widget with monospace font
         self.raw_data_text = Text(
             text_frame,
             wrap=NONE,
-            yscrollcommand=y_scroll.set,
             xscrollcommand=x_scroll.set,
-            font=('Courier', 10),
+            font=RAW_DATA_FONT,
             padx=5,
             pady=5
         )
+        self.raw_line_height = font.Font(font=RAW_DATA_FONT).metrics('linespace')
         
         # Configure scrollbars
-        y_scroll.config(command=self.raw_data_text.yview)
         x_scroll.config(command=self.raw_data_text.xview)
         
         # Layout
@@ -303,8 +837,14 @@ class TestFailureAnalyzer:
         text_frame.grid_rowconfigure(0, weight=1)
         text_frame.grid_columnconfigure(0, weight=1)
         
-        # Auto-update when dropdown changes
+        self.raw_data_text.bind('<Configure>', lambda event: self.render_raw_data())
+        self.raw_data_text.bind('<MouseWheel>', lambda event: self.scroll_raw_data('scroll', -3 if event.delta > 0 else 3, 'units'))
+        self.raw_data_text.bind('<Button-4>', lambda event: self.scroll_raw_data('scroll', -3, 'units'))
+        self.raw_data_text.bind('<Button-5>', lambda event: self.scroll_raw_data('scroll', 3, 'units'))
+        
+        # Auto-update when a filter changes
         self.date_var.trace_add('write', lambda *_: self.update_raw_data_view(raw_window))
+        self.scenario_filter.trace_add('write', lambda *_: self.update_raw_data_view(raw_window))
         
         # Initial data load
         self.update_raw_data_view(raw_window)
@@ -313,48 +853,132 @@ class TestFailureAnalyzer:
         Button(raw_window, text="Close", command=raw_window.destroy).pack(pady=10)
 
     def update_raw_data_view(self, window):
-        # Clear existing content
-        self.raw_data_text.config(state=NORMAL)
-        self.raw_data_text.delete(1.0, END)
-        
-        # Get selected date filter
+        from analyzer import scenario_rows
+
+        # Get selected date filter; a date is a slice of the sorted table
         selected_date = self.date_var.get()
-        
-        # Filter data
         if selected_date == "All Dates":
-            display_data = self.failure_data
+            start, stop = 0, len(self.raw_data)
         else:
-            display_data = self.failure_data[self.failure_data['Date'] == selected_date]
-        
-        # Sort data by date
-        try:
-            sorted_data = display_data.copy()
-            sorted_data['SortDate'] = pd.to_datetime(
-                sorted_data['Date'], 
-                errors='coerce', 
-                format='%d %B %Y'
-            )
-            sorted_data = sorted_data.sort_values('SortDate')
-        except:
-            sorted_data = display_data.sort_values('Date')
+            start, stop = self.raw_ranges[self.date_options[selected_date]]
         
-        # Add total count at the top
-        self.raw_data_text.insert(END, f"Total failure count: {len(sorted_data)}\n\n")
-        
-        # Add header with S.No
-        self.raw_data_text.insert(END, f"{'S.No':<5} | {'Date':<20} | {'Scenario':<70}\n")
-        self.raw_data_text.insert(END, "-"*100 + "\n")
-        
-        # Add data rows with serial numbers
-        for idx, (_, row) in enumerate(sorted_data.iterrows(), start=1):
-            self.raw_data_text.insert(END, f"{idx:<5} | {row['Date']:<20} | {row['Scenario']:<70}\n")
+        self.raw_rows = scenario_rows(self.raw_data, start, stop, self.scenario_filter.get().strip())
+        self.raw_offset = 0
         
         # Update window title
-        window.title(f"Test Failures - {selected_date} ({len(sorted_data)} failures)")
+        window.title(f"Test Failures - {selected_date} ({len(self.raw_rows)} failures)")
+        self.render_raw_data()
+
+    def visible_raw_rows(self):
+        return max(1, self.raw_data_text.winfo_height() // self.raw_line_height - RAW_HEADER_LINES)
+
+    def scroll_raw_data(self, action, amount, unit=None):
+        total = len(self.raw_rows)
+        page = self.visible_raw_rows()
+        if action == 'moveto':
+            self.raw_offset = int(float(amount) * total)
+        elif unit == 'pages':
+            self.raw_offset += int(amount) * page
+        else:
+            self.raw_offset += int(amount)
+        self.raw_offset = max(0, min(self.raw_offset, total - page))
+        self.render_raw_data()
+
+    def render_raw_data(self):
+        """Show the page of self.raw_rows at the current offset with a single text insert"""
+        from parser import format_dates
+
+        total = len(self.raw_rows)
+        page = self.visible_raw_rows()
+        self.raw_offset = max(0, min(self.raw_offset, total - page))
+        rows = self.raw_data.iloc[self.raw_rows[self.raw_offset:self.raw_offset + page]]
         
-        # Make text read-only and scroll to top
+        # Total count and header with S.No, then the rows with serial numbers
+        lines = [
+            f"Total failure count: {total}",
+            "",
+            f"{'S.No':<5} | {'Date':<20} | {'Scenario':<70}",
+            "-"*100,
+        ]
+        serials = range(self.raw_offset + 1, self.raw_offset + len(rows) + 1)
+        lines.extend(
+            f"{idx:<5} | {date:<20} | {scenario:<70}"
+            for idx, date, scenario in zip(serials, format_dates(rows['Date']), rows['Scenario'])
+        )
+        
+        self.raw_data_text.config(state=NORMAL)
+        self.raw_data_text.delete(1.0, END)
+        self.raw_data_text.insert(END, "\n".join(lines) + "\n")
         self.raw_data_text.config(state=DISABLED)
-        self.raw_data_text.see(1.0)
+        
+        if total:
+            self.raw_data_scrollbar.set(self.raw_offset / total, min(1.0, (self.raw_offset + page) / total))
+        else:
+            self.raw_data_scrollbar.set(0.0, 1.0)
+
+    def show_history(self):
+        from analyzer import failure_dates_display
+        from parser import format_date, UNKNOWN_DATE
+
+        # The history connection is shared with the analysis thread
+        if self.analysis_thread is not None and self.analysis_thread.is_alive():
+            messagebox.showwarning("Warning", "Wait for the current analysis to finish")
+            return
+        try:
+            history = self.get_failure_history()
+            grouped = history.grouped()
+            dates_display = failure_dates_display(history.scenario_dates())
+            dates = history.dates()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to read failure history: {str(e)}")
+            return
+        if grouped.empty:
+            messagebox.showwarning("Warning", "The failure history is empty, enable 'Record failure history' and analyze")
+            return
+
+        history_window = Toplevel(self.root)
+        history_window.title(f"Failure History ({grouped['Failures'].sum()} failures, {len(dates)} dates)")
+        history_window.geometry("1000x700")
+
+        # Aggregates per scenario, computed by SQLite
+        tree_frame = Frame(history_window)
+        tree_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
+        columns = RESULT_COLUMNS + ('Dates Failed',)
+        tree = ttk.Treeview(tree_frame, columns=columns, show='headings')
+        for column, width in zip(columns, (300, 80, 120, 120, 350)):
+            tree.heading(column, text=column)
+            tree.column(column, width=width)
+        y_scroll = ttk.Scrollbar(tree_frame, orient=VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=y_scroll.set)
+        tree.grid(row=0, column=0, sticky=NSEW)
+        y_scroll.grid(row=0, column=1, sticky=NS)
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+        for scenario, failures, first_failed, last_failed in grouped.itertuples(name=None):
+            tree.insert('', 'end', values=(scenario, failures, format_date(first_failed), format_date(last_failed),
+                                           dates_display.get(scenario, "")))
+
+        # Failures of one date, queried through the date index
+        date_frame = Frame(history_window)
+        date_frame.pack(fill=X, padx=5)
+        date_labels = {f"{UNKNOWN_DATE if date is None else format_date(date)} ({count})": date for date, count in dates}
+        Label(date_frame, text="Failures on:").pack(side=LEFT, padx=5)
+        date_var = StringVar(value=next(iter(date_labels)))
+        OptionMenu(date_frame, date_var, *date_labels).pack(side=LEFT, padx=5)
+        day_text = Text(history_window, height=10, wrap=NONE, font=RAW_DATA_FONT)
+        day_text.pack(fill=X, padx=5, pady=5)
+
+        def show_date(*_):
+            day_text.config(state=NORMAL)
+            day_text.delete(1.0, END)
+            rows = history.failures_on(date_labels[date_var.get()])
+            day_text.insert(END, "\n".join(f"{scenario:<70} | {filename}" for scenario, filename in rows))
+            day_text.config(state=DISABLED)
+
+        date_var.trace_add('write', show_date)
+        show_date()
+
+        Button(history_window, text="Close", command=history_window.destroy).pack(pady=10)
 
 if __name__ == "__main__":
     root = Tk()
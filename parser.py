@@ -1,14 +1,68 @@
 import os
+import io
 import re
+import time
+import codecs
 import chardet
 import pandas as pd
 from datetime import datetime
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from cache import file_identity, FINGERPRINT_BYTES
+from scanner import result_file_sizes, open_result_file, is_compressed
+from formats import format_scanner
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+FAILURE_COLUMNS = ['Scenario', 'Date', 'Filename']
+DATE_FORMAT = "%d %B %Y"
+UNKNOWN_DATE = "unknown_date"
+ENCODING_SAMPLE_BYTES = 10000
+SCAN_CHUNK_BYTES = 1024 * 1024
+CANCEL_POLL_SECONDS = 0.2
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_encoding_memo = {}
+
+class ParseCancelled(Exception):
+    """Raised by reads of a file being parsed once the analysis is cancelled"""
+
+class _CancellableFile(io.FileIO):
+    # Every block read checks the event, so even a single huge file stops promptly
+    def __init__(self, file_path, cancel_event):
+        super().__init__(file_path, 'rb')
+        self.cancel_event = cancel_event
+
+    def _check(self):
+        if self.cancel_event.is_set():
+            raise ParseCancelled(self.name)
+
+    def read(self, size=-1):
+        self._check()
+        return super().read(size)
+
+    def readall(self):
+        self._check()
+        return super().readall()
+
+    def readinto(self, buffer):
+        self._check()
+        return super().readinto(buffer)
+
+def _open_binary(file_path, cancel_event=None):
+    if cancel_event is None:
+        return open(file_path, 'rb')
+    return io.BufferedReader(_CancellableFile(file_path, cancel_event))
 
 def extract_date_from_filename(filename):
     """Extract date from filename in format MMDDYYYY or DDMMYYYY and return as 'DD Month YYYY'"""
     date_match = re.search(r'(\d{2})(\d{2})(\d{4})', filename)
     if not date_match:
-        return "unknown_date"
+        return UNKNOWN_DATE
     try:
         # Try MM DD YYYY format first
         month, day, year = date_match.groups()
@@ -19,14 +73,70 @@ def extract_date_from_filename(filename):
             day, month, year = date_match.groups()
             date_obj = datetime.strptime(f"{day}{month}{year}", "%d%m%Y")
         except ValueError:
-            return "unknown_date"
-    return date_obj.strftime("%d %B %Y")
+            return UNKNOWN_DATE
+    return date_obj.strftime(DATE_FORMAT)
 
-def detect_file_encoding(file_path):
-    """Detect file encoding using chardet"""
+def _encoding_memo_key(file_path):
+    """Files in the same directory whose names only differ in digits share an encoding memo entry"""
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    return directory, re.sub(r'\d+', '#', filename)
+
+def clear_encoding_cache():
+    _encoding_memo.clear()
+
+def _is_strict_utf8(sample, is_tail=False):
+    if is_tail:
+        # The tail sample may start in the middle of a multi-byte sequence
+        offset = 0
+        while offset < 3 and offset < len(sample) and 0x80 <= sample[offset] <= 0xBF:
+            offset += 1
+        sample = sample[offset:]
+    if b'\x00' in sample:
+        # NUL is valid UTF-8 but never appears in a text log; BOM-less UTF-16/32 is full of them
+        return False
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+def _read_encoding_samples(file_path):
     with open(file_path, 'rb') as f:
-        rawdata = f.read(10000)
-    return chardet.detect(rawdata)['encoding']
+        head = f.read(ENCODING_SAMPLE_BYTES)
+        f.seek(0, os.SEEK_END)
+        file_size = f.tell()
+        if file_size > ENCODING_SAMPLE_BYTES:
+            f.seek(max(ENCODING_SAMPLE_BYTES, file_size - ENCODING_SAMPLE_BYTES))
+            tail = f.read()
+        else:
+            tail = b''
+    return head, tail
+
+def detect_file_encoding(file_path):
+    """Detect file encoding from a BOM, a strict UTF-8 check, or chardet as a last resort.
+
+    Both the head and the tail of the file are sampled, since the tail is the part that is
+    actually decoded. chardet results are memoized per directory and file name pattern.
+    """
+    if is_compressed(file_path):
+        # Reaching the tail would mean decompressing the whole stream, sample the head only
+        with open_result_file(file_path) as f:
+            head = f.read(ENCODING_SAMPLE_BYTES)
+        tail = b''
+    else:
+        head, tail = _read_encoding_samples(file_path)
+
+    for bom, encoding in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+
+    if _is_strict_utf8(head) and _is_strict_utf8(tail, is_tail=True):
+        return 'utf-8'
+
+    key = _encoding_memo_key(file_path)
+    if key not in _encoding_memo:
+        _encoding_memo[key] = chardet.detect(head + tail)['encoding']
+    return _encoding_memo[key]
 
 def read_last_lines(file_path, num_lines=15, encoding='utf-8'):
     """Read last N lines from a text file efficiently with encoding support"""
@@ -59,77 +169,517 @@ def read_last_lines(file_path, num_lines=15, encoding='utf-8'):
 
     return [line for line in lines[-num_lines:] if line.strip()]
 
-def parse_test_results(directory, reverse_parse=True):
-    failure_data = []
-    failure_pattern = re.compile(r'^\s*([\w_]+\.feature:\d+.*?)\s*$', re.MULTILINE)
+def _resolve_encoding(f, encoding):
+    """Pin BOM-dependent codecs (utf-16/utf-32) to an explicit byte order so raw bytes can be split on newlines.
+
+    utf-8-sig becomes utf-8, whose encoded newline does not carry a BOM; the BOM itself
+    is stripped from the decoded first line.
+    """
+    name = codecs.lookup(encoding).name
+    if name == 'utf-8-sig':
+        return 'utf-8'
+    if name not in ('utf-16', 'utf-32'):
+        return name
+    f.seek(0)
+    head = f.read(4)
+    if name == 'utf-32':
+        return 'utf-32-be' if head.startswith(codecs.BOM_UTF32_BE) else 'utf-32-le'
+    return 'utf-16-be' if head.startswith(codecs.BOM_UTF16_BE) else 'utf-16-le'
+
+def _iter_lines_reversed(f, newline=b'\n', block_size=65536, stats=None):
+    """Yield raw byte lines from the end of a binary file towards the start"""
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    remainder = b''
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        if stats is not None:
+            stats['bytes_read'] = stats.get('bytes_read', 0) + read_size
+        f.seek(position)
+        parts = (f.read(read_size) + remainder).split(newline)
+        remainder = parts[0]
+        for part in reversed(parts[1:]):
+            yield part
+    yield remainder
+
+def read_failure_section(file_path, encoding='utf-8', stats=None, cancel_event=None):
+    """Return the failing scenarios listed above the run summary, reading the file backwards.
+
+    Only the trailing summary and the failure section itself are read and decoded, so the
+    cost is proportional to the length of the section rather than the size of the log.
+    The report format is the one whose summary is found in the last lines (see formats.py).
+    Returns an empty list if there is no summary in the last lines or no failure section.
+    The number of bytes read is added to ``stats['bytes_read']`` when a dict is given, and
+    the detected format name is stored in ``stats['format']``. Reads raise ParseCancelled
+    once ``cancel_event`` is set.
+    """
+    scanner = format_scanner()
+    with _open_binary(file_path, cancel_event) as f:
+        encoding = _resolve_encoding(f, encoding)
+        newline = '\n'.encode(encoding)
+
+        lines = (
+            line for line in (
+                raw_line.decode(encoding, errors='replace').strip().lstrip('\ufeff')
+                for raw_line in _iter_lines_reversed(f, newline, stats=stats)
+            ) if line
+        )
+
+        # The summary has to be within the last lines; anything above the top of
+        # its block in that window may already belong to the failure section
+        trailer = list(islice(lines, scanner.trailer_lines))
+        report_format, summary_start = scanner.find_summary(trailer)
+        if report_format is None:
+            return []
+        _set_format(stats, report_format)
+
+        section = []
+        opened = False
+        for line in chain(trailer[summary_start + 1:], lines):
+            owners, rest = scanner.split_marker(line)
+            if report_format in owners:
+                scenario = report_format.scenario(rest)
+                if scenario is not None:
+                    section.append(scenario)
+                # Sections directly above this one (e.g. errors above failures) are part of the same summary
+                opened = True
+                continue
+            scenario = report_format.scenario(line)
+            if scenario is not None:
+                section.append(scenario)
+                opened = False
+            elif opened:
+                return section[::-1]
+            elif not report_format.is_filler(line):
+                # Left the failure section without meeting its marker
+                return []
+        if opened:
+            return section[::-1]
+    return []
+
+def _set_format(stats, report_format):
+    if stats is not None:
+        stats['format'] = report_format.name
+
+def _encode_text(text, encoding):
+    if encoding == 'utf-8-sig':
+        encoding = 'utf-8'
+    return text.encode(encoding)
+
+def _find_marker_offset(f, markers, overlap, alignment=1, chunk_size=SCAN_CHUNK_BYTES):
+    """Return (byte offset, marker index) of the first case-insensitive marker in a binary file, or (None, None).
+
+    ``markers`` are lowercased encoded markers. Each chunk is lowercased once and searched
+    with bytes.find per marker, which stays close to a single memchr-speed pass however
+    many markers there are; a case-insensitive regex alternation is an order of magnitude slower.
+    """
+    position = 0
+    previous = b''
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return None, None
+        window = previous + chunk.lower()
+        window_start = position - len(previous)
+        found = None
+        for index, marker in enumerate(markers):
+            # Only a match starting before the best one so far can win
+            end = len(window) if found is None else found[0] + len(marker)
+            start = window.find(marker, 0, end)
+            while start != -1 and (window_start + start) % alignment:
+                start = window.find(marker, start + 1, end)
+            if start != -1 and (found is None or start < found[0]):
+                found = (start, index)
+        if found is not None:
+            return window_start + found[0], found[1]
+        position += len(chunk)
+        previous = window[-overlap:]
+        # Keep the carried-over bytes aligned to the code unit size
+        previous = previous[len(previous) % alignment:]
+
+def scan_failure_section(file_path, encoding='utf-8', stats=None, cancel_event=None):
+    """Return the failing scenarios after the first failure marker, scanning the file front to back.
+
+    The markers of every report format are searched for in one pass over fixed-size byte chunks
+    and only the bytes from the first marker onward are decoded, line by line, so memory
+    use does not depend on the file size. The format is the marker's, or for a marker
+    shared by several formats the one whose failure lines follow it. Reads raise
+    ParseCancelled once ``cancel_event`` is set.
+    """
+    scanner = format_scanner()
+    with _open_binary(file_path, cancel_event) as f:
+        encoding = _resolve_encoding(f, encoding)
+        f.seek(0)
+        markers = [_encode_text(marker, encoding).lower() for marker in scanner.markers]
+        alignment = len(_encode_text('\n', encoding))
+        offset, index = _find_marker_offset(f, markers, max(len(marker) for marker in markers), alignment)
+        if offset is None:
+            _add_bytes_read(stats, f.tell())
+            return []
+
+        f.seek(offset)
+        text = io.TextIOWrapper(f, encoding=encoding, errors='replace')
+        try:
+            scenarios = _collect_failures(text, scanner.marker_formats[index], stats)
+        finally:
+            text.detach()
+        _add_bytes_read(stats, f.tell())
+    return scenarios
+
+def _collect_failures(lines, candidates, stats):
+    """Every failure line of the first candidate format that has one, for the lines from a marker on"""
+    scanner = format_scanner()
+    scenarios = []
+    for line in lines:
+        # A failure may follow the marker on its own line
+        _, line = scanner.split_marker(line.strip())
+        for report_format in candidates:
+            scenario = report_format.scenario(line)
+            if scenario is not None:
+                scenarios.append(scenario)
+                candidates = (report_format,)
+                break
+    if len(candidates) == 1:
+        _set_format(stats, candidates[0])
+    return scenarios
+
+def _add_bytes_read(stats, count):
+    if stats is not None:
+        stats['bytes_read'] = stats.get('bytes_read', 0) + count
+
+def _stream_tail_section(lines, stats=None):
+    """Forward-only equivalent of read_failure_section for streams that cannot be read backwards.
 
-    for filename in os.listdir(directory):
-        if not filename.endswith('.txt'):
+    Keeps only the most recent failure section, which is accepted if it is directly
+    followed by a summary of its format within the last lines of the stream.
+    """
+    scanner = format_scanner()
+    section = None
+    candidates = ()
+    closed = False
+    summary_format = None
+    lines_after = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
             continue
+        owners, rest = scanner.split_marker(line)
+        if owners:
+            if section is None or closed or not set(owners) & set(candidates):
+                section = []
+                candidates = owners
+                closed = False
+                summary_format = None
+            else:
+                # A section directly below another one of the same format continues it
+                candidates = tuple(report_format for report_format in candidates if report_format in owners)
+            _add_marker_line_failure(section, candidates, rest)
+            continue
+        if section is None:
+            continue
+        if closed:
+            lines_after += 1
+            continue
+        for report_format in candidates:
+            scenario = report_format.scenario(line)
+            if scenario is not None:
+                section.append(scenario)
+                candidates = (report_format,)
+                break
+        else:
+            if any(report_format.is_filler(line) for report_format in candidates):
+                continue
+            closed = True
+            summary_format = scanner.summary_format(line)
+            lines_after = 1
+
+    # The line closing the section has to be a summary of its format, within that format's window of the end
+    if section is None or summary_format not in candidates or lines_after > summary_format.summary_window:
+        return []
+    _set_format(stats, summary_format)
+    return section
+
+def _add_marker_line_failure(section, candidates, rest):
+    for report_format in candidates:
+        scenario = report_format.scenario(rest)
+        if scenario is not None:
+            section.append(scenario)
+            return
+
+def _stream_full_section(lines, stats=None):
+    """Forward scan of a line stream: every failure line after the first failure marker"""
+    scanner = format_scanner()
+    for line in lines:
+        owners, _ = scanner.split_marker(line)
+        if owners:
+            return _collect_failures(chain([line], lines), owners, stats)
+    return []
+
+def stream_failure_section(file_path, encoding='utf-8', reverse_parse=True, stats=None, cancel_event=None):
+    """Return the failing scenarios of a compressed log, decompressing it as a stream.
+
+    Only the current line and the failure section are held in memory, in both modes.
+    ``stats['bytes_read']`` counts compressed bytes, the whole file is always read.
+    """
+    _add_bytes_read(stats, os.path.getsize(file_path))
+    with _open_binary(file_path, cancel_event) as raw, open_result_file(file_path, raw) as f:
+        text = io.TextIOWrapper(f, encoding=encoding, errors='replace')
+        if reverse_parse:
+            return _stream_tail_section(text, stats)
+        return _stream_full_section(text, stats)
+
+def parse_file(filepath, reverse_parse=True, encoding=None, filename=None, stats=None, cancel_event=None):
+    """Parse a single test result file and return its list of failure records.
 
+    ``filename`` is the name recorded in the Filename column, the base name by default.
+    When a ``stats`` dict is given, the parse path taken and the bytes read are stored in it.
+    """
+    if filename is None:
+        filename = os.path.basename(filepath)
+    file_date = _file_date(filepath, filename)
+    failure_data = []
+    if not encoding:
+        encoding = detect_file_encoding(filepath) or 'utf-8'
+
+    if stats is not None:
+        stats['path'] = ('stream-' if is_compressed(filepath) else '') + ('reverse' if reverse_parse else 'full-scan')
+
+    if is_compressed(filepath):
+        for scenario in stream_failure_section(filepath, encoding, reverse_parse, stats, cancel_event):
+            failure_data.append({
+                'Scenario': scenario,
+                'Date': file_date,
+                'Filename': filename
+            })
+    elif reverse_parse:
+        for scenario in read_failure_section(filepath, encoding, stats, cancel_event):
+            failure_data.append({
+                'Scenario': scenario,
+                'Date': file_date,
+                'Filename': filename
+            })
+    else:
+        for scenario in scan_failure_section(filepath, encoding, stats, cancel_event):
+            failure_data.append({
+                'Scenario': scenario,
+                'Date': file_date,
+                'Filename': filename
+            })
+
+    return failure_data
+
+def _file_date(filepath, filename):
+    # The date usually is in the file name, nested archives may only have it in a folder name
+    file_date = extract_date_from_filename(os.path.basename(filepath))
+    if file_date == UNKNOWN_DATE:
         file_date = extract_date_from_filename(filename)
-        filepath = os.path.join(directory, filename)
+    return file_date
+
+def _parse_file_safe(filepath, reverse_parse, filename, cancel_event=None):
+    """Worker entry point: returns (records, encoding, error message, stats), only raises ParseCancelled"""
+    stats = {'file': filename, 'path': 'reverse' if reverse_parse else 'full-scan', 'bytes_read': 0,
+             'encoding_seconds': 0.0, 'scan_seconds': 0.0, 'failures': 0}
+    try:
+        start = time.perf_counter()
+        encoding = detect_file_encoding(filepath) or 'utf-8'
+        detected = time.perf_counter()
+        stats['encoding'] = encoding
+        stats['encoding_seconds'] = detected - start
+        stats['bytes_read'] += _encoding_sample_size(filepath)
+
+        records = parse_file(filepath, reverse_parse, encoding, filename, stats, cancel_event)
+        stats['scan_seconds'] = time.perf_counter() - detected
+        stats['failures'] = len(records)
+        return records, encoding, None, stats
+    except ParseCancelled:
+        raise
+    except Exception as e:
+        stats['error'] = str(e)
+        return [], None, str(e), stats
+
+def _terminate_workers(executor):
+    # ProcessPoolExecutor.terminate_workers only exists from Python 3.14; before,
+    # the worker processes are only reachable through the executor's _processes
+    terminate = getattr(executor, 'terminate_workers', None)
+    if terminate is not None:
+        terminate()
+        return
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join()
+
+def _encoding_sample_size(filepath):
+    """Bytes read by detect_file_encoding: the head sample, plus the tail sample for plain files"""
+    if is_compressed(filepath):
+        return ENCODING_SAMPLE_BYTES
+    size = os.path.getsize(filepath)
+    return min(size, ENCODING_SAMPLE_BYTES) + max(0, size - max(ENCODING_SAMPLE_BYTES, size - ENCODING_SAMPLE_BYTES))
 
+def parse_test_results(directory, reverse_parse=True, workers=None, errors=None, cache=None, progress=None, cancel_event=None,
+                       files=None, recursive=False, include=None, exclude=None, report=None, history=None,
+                       aggregator=None, runs=None):
+    """Parse every result file in a directory, optionally with a pool of worker processes.
+
+    Records are merged in file name order regardless of completion order. Per-file
+    errors are appended to ``errors`` as (filename, message) tuples when a list is given.
+    With a ``ParseCache`` only new or modified files are parsed, the rest come from the cache.
+
+    ``progress`` is called after each file as progress(filename, records, files_done,
+    total_files, bytes_done, total_bytes). Setting ``cancel_event`` stops the run early and
+    returns the records of the files completed so far; files still being parsed are
+    interrupted, worker processes terminated. ``files`` restricts the run to the
+    given paths instead of every result file in the directory. ``recursive``, ``include``
+    and ``exclude`` select the files as in ``scanner.iter_result_entries``; the Filename
+    column holds each path relative to ``directory``. Per-file statistics and stage timings
+    are added to ``report`` (an ``instrumentation.IngestReport``) when one is given.
+    With a ``history.FailureHistory`` the records of every successfully parsed file are
+    also stored there; files it already holds unchanged are skipped. With an
+    ``aggregator.FailureAggregator`` each file's records are added to it as soon as the file
+    is done and then dropped, so memory does not grow with the number of failures; the
+    returned table is empty and the results are read from the aggregator. When ``runs`` is
+    a list, (filename, run date) is appended for every file parsed without error, including
+    files without failures; the date is a Timestamp, NaT when unknown.
+    """
+    if files is not None:
+        filepaths = sorted(files)
+        sizes = {filepath: _file_size(filepath) for filepath in filepaths}
+    else:
+        # The directory scan already stat()ed every entry, reuse its sizes
+        sizes = result_file_sizes(directory, recursive, include, exclude)
+        filepaths = sorted(sizes)
+    filenames = {filepath: os.path.relpath(filepath, directory) for filepath in filepaths}
+    total_bytes = sum(sizes.values())
+    done = {'files': 0, 'bytes': 0}
+
+    def file_completed(filepath, result, cached=False):
+        records, encoding, error, stats = result
+        if error is None:
+            store(filepath, records, encoding, cached)
+        if aggregator is not None:
+            aggregator.add_records(records)
+            # Only the error and stats are kept, the records live on in the aggregator
+            result = ([], encoding, error, stats)
+        results[filepath] = result
+        if report is not None:
+            report.add_file(result[3])
+        done['files'] += 1
+        done['bytes'] += sizes[filepath]
+        if progress is not None:
+            progress(filenames[filepath], records, done['files'], len(filepaths), done['bytes'], total_bytes)
+
+    def store(filepath, records, encoding, cached):
+        if cache is not None and not cached and filepath in identities:
+            file_date = _file_date(filepath, filenames[filepath])
+            cache.put(filepath, reverse_parse, identities[filepath], [r['Scenario'] for r in records], encoding, file_date)
+        if history is not None:
+            try:
+                identity = identities.get(filepath) or file_identity(filepath)
+            except OSError:
+                return
+            history.record_file(filepath, identity, records)
+
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+
+    results = {}
+    identities = {}
+    if cache is not None:
+        lookup_start = time.perf_counter()
+        for filepath in filepaths:
+            try:
+                identities[filepath] = file_identity(filepath)
+            except OSError:
+                continue
+            cached = cache.get(filepath, reverse_parse, identities[filepath])
+            if cached is not None:
+                scenarios, encoding, file_date = cached
+                records = [{'Scenario': scenario, 'Date': file_date, 'Filename': filenames[filepath]} for scenario in scenarios]
+                stats = {'file': filenames[filepath], 'path': 'cached', 'bytes_read': FINGERPRINT_BYTES,
+                         'encoding': encoding, 'failures': len(records)}
+                file_completed(filepath, (records, encoding, None, stats), cached=True)
+        if report is not None:
+            report.add_stage_time('cache_lookup', time.perf_counter() - lookup_start)
+    pending = [filepath for filepath in filepaths if filepath not in results]
+
+    if workers is None:
+        workers = min(DEFAULT_WORKERS, len(pending)) or 1
+    if workers <= 1 or len(pending) <= 1:
+        for filepath in pending:
+            try:
+                result = _parse_file_safe(filepath, reverse_parse, filenames[filepath], cancel_event)
+            except ParseCancelled:
+                break
+            file_completed(filepath, result)
+            if cancelled():
+                break
+    else:
+        # Submit the largest files first so a single huge log starts early and
+        # the remaining workers keep draining the smaller ones around it
+        by_size = sorted(pending, key=sizes.get, reverse=True)
+        executor = ProcessPoolExecutor(max_workers=workers)
         try:
-            encoding = detect_file_encoding(filepath)
-            if not encoding:
-                encoding = 'utf-8'
-
-            if reverse_parse:
-                last_lines = read_last_lines(filepath, 15, encoding)
-
-                summary_start = None
-                for i, line in enumerate(last_lines):
-                    if line and line[0].isdigit() and ("features passed" in line or "scenarios passed" in line):
-                        summary_start = i
-                        break
-
-                if summary_start is None:
-                    continue
-
-                with open(filepath, 'r', encoding=encoding, errors='replace') as f:
-                    capture = False
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-
-                        if line.startswith("Failing scenarios:"):
-                            capture = True
-                            continue
-
-                        if capture:
-                            if any(line == summary_line.strip() for summary_line in last_lines[summary_start:] if summary_start is not None and summary_line.strip()):
-                                break
-
-                            match = failure_pattern.match(line)
-                            if match:
-                                scenario = match.group(1).strip()
-                                failure_data.append({
-                                    'Scenario': scenario,
-                                    'Date': file_date,
-                                    'Filename': filename
-                                })
+            futures = {executor.submit(_parse_file_safe, filepath, reverse_parse, filenames[filepath]): filepath for filepath in by_size}
+            running = set(futures)
+            while running and not cancelled():
+                # Wake up regularly so a cancel is noticed while a huge file is still being parsed
+                finished, running = wait(running, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    file_completed(futures[future], future.result())
+        finally:
+            if cancelled():
+                # Files still being parsed are not waited for, their workers are killed
+                _terminate_workers(executor)
             else:
-                with open(filepath, 'r', encoding=encoding, errors='replace') as f:
-                    content = f.read()
-                    summary_match = re.search(r'Failing scenarios:|Failed scenarios:', content, re.IGNORECASE)
-                    if not summary_match:
-                        continue
-
-                    summary_section = content[summary_match.start():]
-                    failed_scenarios = failure_pattern.findall(summary_section)
-
-                    for scenario in failed_scenarios:
-                        scenario = scenario.strip()
-                        if scenario:
-                            failure_data.append({
-                                'Scenario': scenario,
-                                'Date': file_date,
-                                'Filename': filename
-                            })
-        except Exception as e:
-            print(f"Error processing {filename}: {str(e)}")
+                executor.shutdown()
+
+    if cache is not None:
+        cache.commit()
+    if history is not None:
+        history.commit()
+
+    merge_start = time.perf_counter()
+    failure_data = []
+    for filepath in filepaths:
+        if filepath not in results:
             continue
+        records, _, error, _ = results[filepath]
+        failure_data.extend(records)
+        if error is not None and errors is not None:
+            errors.append((filenames[filepath], error))
+        if error is None and runs is not None:
+            runs.append((filenames[filepath], pd.to_datetime(_file_date(filepath, filenames[filepath]), format=DATE_FORMAT, errors='coerce')))
+
+    table = failure_table(failure_data)
+    if report is not None:
+        report.add_stage_time('merge', time.perf_counter() - merge_start)
+        report.finish()
+    return table
+
+def failure_table(records):
+    """Build the typed failure table: datetime64 dates (NaT when unknown) and categorical names"""
+    table = pd.DataFrame(records, columns=FAILURE_COLUMNS)
+    table['Date'] = pd.to_datetime(table['Date'], format=DATE_FORMAT, errors='coerce')
+    return table.astype({'Scenario': 'category', 'Filename': 'category'})
 
-    return pd.DataFrame(failure_data)
+def concat_failure_tables(tables):
+    """Concatenate failure tables, keeping the categorical columns categorical"""
+    table = pd.concat(tables, ignore_index=True)
+    return table.astype({'Scenario': 'category', 'Filename': 'category'})
+
+def format_date(value):
+    """Format a single failure date for display"""
+    return UNKNOWN_DATE if pd.isna(value) else value.strftime(DATE_FORMAT)
+
+def format_dates(dates):
+    """Format a datetime64 Series of failure dates for display or export"""
+    return dates.dt.strftime(DATE_FORMAT).fillna(UNKNOWN_DATE)
+
+def _file_size(filepath):
+    try:
+        return os.path.getsize(filepath)
+    except OSError:
+        return 0
@@ -0,0 +1,62 @@
+import os
+import bz2
+import gzip
+import lzma
+from fnmatch import fnmatch
+
+DEFAULT_INCLUDE = ('*.txt', '*.txt.gz', '*.txt.bz2', '*.txt.xz')
+_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+def is_compressed(path):
+    return os.path.splitext(path)[1].lower() in _OPENERS
+
+def open_result_file(path, fileobj=None):
+    """Open a result file for binary reading, decompressing .gz/.bz2/.xz logs on the fly.
+
+    ``fileobj`` is an already open binary file of ``path`` to read from instead; it is
+    not closed with the returned file.
+    """
+    opener = _OPENERS.get(os.path.splitext(path)[1].lower())
+    if opener is None:
+        return fileobj if fileobj is not None else open(path, 'rb')
+    return opener(fileobj if fileobj is not None else path, 'rb')
+
+def _matches(relpath, name, patterns):
+    # Patterns without a separator apply to the file name, others to the relative path
+    relpath = relpath.replace(os.sep, '/')
+    return any(fnmatch(relpath if '/' in pattern else name, pattern) for pattern in patterns)
+
+def iter_result_entries(directory, recursive=False, include=None, exclude=None):
+    """Yield (path, relpath, stat) for every result file under a directory.
+
+    ``include`` and ``exclude`` are glob patterns; a pattern containing '/' is matched
+    against the path relative to ``directory``, otherwise against the file name. When
+    recursing, excluded directories are not descended into.
+    """
+    include = tuple(include) if include else DEFAULT_INCLUDE
+    exclude = tuple(exclude or ())
+    pending = [(directory, '')]
+    while pending:
+        current, prefix = pending.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                relpath = prefix + entry.name
+                if _matches(relpath, entry.name, exclude):
+                    continue
+                if entry.is_dir():
+                    if recursive:
+                        pending.append((entry.path, relpath + os.sep))
+                elif entry.is_file() and _matches(relpath, entry.name, include):
+                    yield entry.path, relpath, entry.stat()
+
+def list_result_files(directory, recursive=False, include=None, exclude=None):
+    """Return the sorted paths of the result files under a directory"""
+    return sorted(path for path, _, _ in iter_result_entries(directory, recursive, include, exclude))
+
+def result_file_sizes(directory, recursive=False, include=None, exclude=None):
+    """Return {path: size} for the result files under a directory, sizes from the scandir entries"""
+    return {path: stat.st_size for path, _, stat in iter_result_entries(directory, recursive, include, exclude)}
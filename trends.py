@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOW = 7
+TREND_COLUMNS = ('Failure Rate', 'Recent Failures', 'Current Streak', 'Longest Streak', 'Flakiness')
+
+class TrendIndex:
+    """Per-scenario flakiness and trend statistics over the sequence of run dates.
+
+    A run date is a day on which at least one result file was parsed, with or without
+    failures. For every scenario the index keeps how many runs it failed, its current
+    and longest streak of consecutive failed runs, how often it flipped between passing
+    and failing, and which of the last ``window`` runs it failed (as a bitmask).
+
+    Runs are folded in one date at a time, vectorized over scenarios, so adding the
+    newest nightly run costs one step instead of a rebuild.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        if not 1 <= window <= 62:
+            raise ValueError("window must be between 1 and 62 runs")
+        self.window = window
+        self.run_dates = pd.DatetimeIndex([])
+        self.scenarios = pd.Index([], dtype=object)
+        self.failed_runs = np.zeros(0, dtype=np.int64)
+        self.current_streak = np.zeros(0, dtype=np.int64)
+        self.longest_streak = np.zeros(0, dtype=np.int64)
+        self.flips = np.zeros(0, dtype=np.int64)
+        self.last_failed = np.zeros(0, dtype=bool)
+        self.recent = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def build(cls, failure_data, run_dates, window=DEFAULT_WINDOW):
+        index = cls(window)
+        index.add_runs(failure_data, run_dates)
+        return index
+
+    def can_add(self, failure_data, run_dates):
+        """True when the runs only append to the index: every new date is after the last known run
+        and every dated failure falls on one of the new dates"""
+        new_dates = _run_index(run_dates).difference(self.run_dates)
+        if len(self.run_dates) and len(new_dates) and new_dates[0] <= self.run_dates[-1]:
+            return False
+        failure_dates = failure_data['Date'].dropna()
+        return bool(failure_dates.isin(new_dates).all())
+
+    def add_runs(self, failure_data, run_dates):
+        """Fold new runs and their failures into the index; raises ValueError if can_add is False"""
+        if not self.can_add(failure_data, run_dates):
+            raise ValueError("runs are not newer than the indexed ones, rebuild the index instead")
+        new_dates = _run_index(run_dates).difference(self.run_dates)
+        self._add_scenarios(failure_data['Scenario'].unique())
+
+        # Scenario x new run date matrix of "failed on that run"
+        pairs = failure_data.loc[failure_data['Date'].notna(), ['Scenario', 'Date']].drop_duplicates()
+        failed = np.zeros((len(self.scenarios), len(new_dates)), dtype=bool)
+        failed[self.scenarios.get_indexer(pairs['Scenario']), new_dates.get_indexer(pairs['Date'])] = True
+
+        mask = (1 << self.window) - 1
+        for column in range(len(new_dates)):
+            flags = failed[:, column]
+            self.failed_runs += flags
+            self.current_streak = np.where(flags, self.current_streak + 1, 0)
+            np.maximum(self.longest_streak, self.current_streak, out=self.longest_streak)
+            if len(self.run_dates) or column:
+                self.flips += flags != self.last_failed
+            self.last_failed = flags.copy()
+            self.recent = ((self.recent << 1) | flags) & mask
+        self.run_dates = self.run_dates.append(new_dates)
+
+    def _add_scenarios(self, scenarios):
+        # Scenarios seen for the first time passed every run indexed so far
+        new = pd.Index(scenarios, dtype=object).difference(self.scenarios)
+        if not len(new):
+            return
+        self.scenarios = self.scenarios.append(new)
+        for name in ('failed_runs', 'current_streak', 'longest_streak', 'flips', 'last_failed', 'recent'):
+            values = getattr(self, name)
+            setattr(self, name, np.concatenate([values, np.zeros(len(new), dtype=values.dtype)]))
+
+    def table(self):
+        """The trend columns indexed by scenario.
+
+        Failure Rate is the share of all runs the scenario failed, Recent Failures how many of
+        the last ``window`` runs it failed, and Flakiness the share of consecutive runs where
+        its outcome flipped (0 for a scenario that always passes or always fails).
+        """
+        runs = len(self.run_dates)
+        recent = sum((self.recent >> bit) & 1 for bit in range(self.window))
+        return pd.DataFrame({
+            'Failure Rate': self.failed_runs / runs if runs else np.zeros(len(self.scenarios)),
+            'Recent Failures': recent,
+            'Current Streak': self.current_streak,
+            'Longest Streak': self.longest_streak,
+            'Flakiness': self.flips / (runs - 1) if runs > 1 else np.zeros(len(self.scenarios)),
+        }, index=pd.Index(self.scenarios, name='Scenario'))
+
+def add_trend_columns(grouped, trend_index):
+    """Return a group_failures table with the trend columns of its scenarios added or refreshed"""
+    trends = trend_index.table().reindex(grouped.index.astype(object))
+    grouped = grouped.drop(columns=list(TREND_COLUMNS), errors='ignore')
+    for column in TREND_COLUMNS:
+        grouped[column] = trends[column].to_numpy()
+    return grouped
+
+def _run_index(run_dates):
+    # Sorted distinct known run dates; several files on one day are a single run
+    return pd.DatetimeIndex(list(run_dates)).dropna().unique().sort_values()
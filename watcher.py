@@ -0,0 +1,47 @@
+from scanner import iter_result_entries
+
+class DirectoryWatcher:
+    """Tracks the result files of a directory between polls.
+
+    A file is reported once it is new or changed since it was last reported and its
+    size and mtime did not move since the previous poll, i.e. it finished growing.
+    Only ``os.scandir`` entries are looked at, files are never opened. ``recursive``,
+    ``include`` and ``exclude`` select files as in ``scanner.iter_result_entries``.
+    """
+
+    def __init__(self, directory, recursive=False, include=None, exclude=None):
+        self.directory = directory
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+        self.processed = {}
+        self.last_seen = {}
+
+    def snapshot(self):
+        """Return {path: (size, mtime_ns)} for every result file in the directory"""
+        return {
+            path: (stat.st_size, stat.st_mtime_ns)
+            for path, _, stat in iter_result_entries(self.directory, self.recursive, self.include, self.exclude)
+        }
+
+    def mark_processed(self, snapshot=None):
+        """Treat the files of a snapshot (default: the current one) as already parsed"""
+        if snapshot is None:
+            snapshot = self.snapshot()
+        self.processed.update(snapshot)
+        self.last_seen = dict(snapshot)
+
+    def poll(self):
+        """Return (ready, removed) lists of paths: files to (re)parse and files that disappeared"""
+        current = self.snapshot()
+        ready = sorted(
+            path for path, identity in current.items()
+            if self.processed.get(path) != identity and self.last_seen.get(path) == identity
+        )
+        removed = sorted(path for path in self.processed if path not in current)
+        for path in removed:
+            del self.processed[path]
+        for path in ready:
+            self.processed[path] = current[path]
+        self.last_seen = current
+        return ready, removed